@@ -1,5 +1,6 @@
 from typing import List, Callable, Tuple
 from collections import defaultdict
+from array import array
 
 class OfflineDynamicConnectivity():
 
@@ -87,93 +88,213 @@ class OfflineDynamicConnectivity():
     self._bit = n.bit_length() + 1
     self._msk = (1 << self._bit) - 1
     self._query_count = 0
-    self._edge = defaultdict(list)
+    # 辺の追加/削除のイベント. 辺と (時刻<<1|種類) を別々に積んで、run で1回だけソートする
+    self._ev_edge = []
+    self._ev_time = []
     self.uf = OfflineDynamicConnectivity.UndoableUnionFind(n)
 
   def add_edge(self, u: int, v: int) -> None:
     assert 0 <= u < self._n and 0 <= v < self._n
     if u > v:
       u, v = v, u
-    self._edge[u<<self._bit|v].append(self._query_count<<1)
+    self._ev_edge.append(u<<self._bit|v)
+    self._ev_time.append(self._query_count<<1)
     self._query_count += 1
 
   def delete_edge(self, u: int, v: int) -> None:
     assert 0 <= u < self._n and 0 <= v < self._n
     if u > v:
       u, v = v, u
-    self._edge[u<<self._bit|v].append(self._query_count<<1|1)
+    self._ev_edge.append(u<<self._bit|v)
+    self._ev_time.append(self._query_count<<1|1)
     self._query_count += 1
 
   def add_relax(self) -> None:
     self._query_count += 1
 
   def init_edge(self, E: List[Tuple[int, int]]) -> None:
-    bit, edge = self._bit, self._edge
+    bit, ev_edge, ev_time = self._bit, self._ev_edge, self._ev_time
     for u, v in E:
       assert 0 <= u < self._n and 0 <= v < self._n
       if u > v:
         u, v = v, u
-      edge[u<<bit|v].append(0)
+      ev_edge.append(u<<bit|v)
+      ev_time.append(0)
     self._query_count += 1
 
   def run(self, out: Callable[[int], None]) -> None:
     # O(qlogqlogn)
+    # out(t)の中では、self.same / self.size / self.group_sum などで時刻tの状態を参照できる
     uf, bit, msk, q = self.uf, self._bit, self._msk, self._query_count
     log  = (q - 1).bit_length()
     size = 1 << log
-    data = [[] for _ in range(size<<1)]
     size2 = size * 2
-    for k, v in self._edge.items():
-      LR = []
-      i = 0
-      cnt = 0
-      while i < len(v):
-        if v[i] & 1 == 0:
-          cnt += 1
-        if cnt > 0:
-          LR.append(v[i]>>1)
-          i += 1
-          while i < len(v) and cnt > 0:
-            if v[i] & 1 == 0:
-              cnt += 1
-            else:
-              assert cnt >= 0, f'Edge Error: minus edge.'
-              cnt -= 1
-              if cnt == 0:
-                LR.append(v[i]>>1)
-            i += 1
-          i -= 1
-        i += 1
-      if cnt > 0:
-        LR.append(q)
-      LR.reverse()
-      while LR:
-        l = LR.pop() + size
-        r = LR.pop() + size
-        while l < r:
-          if l & 1:
-            data[l].append(k)
-            l += 1
-          if r & 1:
-            data[r^1].append(k)
-          l >>= 1
-          r >>= 1
+
+    # 辺ごとの追加/削除を (辺, 時刻, 種類) の1つの整数にして1回ソートする
+    tbit = (q + 1).bit_length() + 1
+    ev = [k << tbit | x for k, x in zip(self._ev_edge, self._ev_time)]
+    ev.sort()
+
+    # 各辺の存在区間を時刻のセグ木に載せる. 辺が載るノードにだけlistを作る
+    tmsk = (1 << tbit) - 1
+    data = [None] * size2
+    def push(l: int, r: int, k: int) -> None:
+      l += size
+      r += size
+      while l < r:
+        if l & 1:
+          d = data[l]
+          if d is None:
+            data[l] = [k]
+          else:
+            d.append(k)
+          l += 1
+        if r & 1:
+          d = data[r^1]
+          if d is None:
+            data[r^1] = [k]
+          else:
+            d.append(k)
+        l >>= 1
+        r >>= 1
+    pk, cnt, L = -1, 0, 0
+    for x in ev:
+      k = x >> tbit
+      if k != pk:
+        if cnt > 0 and L < q:
+          push(L, q, pk)
+        pk, cnt = k, 0
+      x &= tmsk
+      if x & 1 == 0:
+        if cnt == 0:
+          L = x >> 1
+        cnt += 1
+      else:
+        assert cnt > 0, f'Edge Error: minus edge.'
+        cnt -= 1
+        if cnt == 0 and L < x >> 1:
+          push(L, x >> 1, k)
+    if cnt > 0 and L < q:
+      push(L, q, pk)
+
+    # sub[v]: 部分木vに載っている辺の個数. 0なら降りずに、その区間の時刻をまとめてoutする
+    sub = array('i', bytes(4*size2))
+    for v in range(size2-1, 0, -1):
+      d = data[v]
+      if d is not None:
+        sub[v] += len(d)
+      if v > 1:
+        sub[v>>1] += sub[v]
+
+    # unite/undoはここに展開する. 実際に併合した回数cntを~cntとして積み、戻るときにその回数だけundoする
+    par, all_sum, one_sum, hist = uf._parents, uf._all_sum, uf._one_sum, uf._history
     todo = [1]
     while todo:
       v = todo.pop()
       if v >= 0:
-        for uv in data[v]:
-          uf.unite(uv>>bit, uv&msk)
-        todo.append(~v)
+        if sub[v] == 0:
+          h = log + 1 - v.bit_length()
+          l = (v << h) - size
+          for t in range(l, min(l + (1 << h), q)):
+            out(t)
+          continue
+        d = data[v]
+        if d is not None:
+          cnt = 0
+          for uv in d:
+            x = uv >> bit
+            px = par[x]
+            while px >= 0:
+              x = px
+              px = par[x]
+            y = uv & msk
+            py = par[y]
+            while py >= 0:
+              y = py
+              py = par[y]
+            if x == y: continue
+            if px > py:
+              x, y, px, py = y, x, py, px
+            ax, ay = all_sum[x], all_sum[y]
+            hist.append((x, px, ax))
+            hist.append((y, py, ay))
+            all_sum[x] = ax + ay
+            one_sum[x] += one_sum[y]
+            par[x] = px + py
+            par[y] = x
+            cnt += 1
+          if cnt:
+            uf._group_count -= cnt
+            todo.append(~cnt)
         if v<<1|1 < size2:
           todo.append(v<<1|1)
           todo.append(v<<1)
         elif v - size < q:
           out(v-size)
       else:
-        for _ in data[~v]:
-          uf.undo()
+        cnt = ~v
+        uf._group_count += cnt
+        for _ in range(cnt):
+          y, py, all_sum_y = hist.pop()
+          x, px, all_sum_x = hist.pop()
+          par[y] = py
+          par[x] = px
+          t = (all_sum[x] - all_sum_y - all_sum_x) // (-py-px) * (-py)
+          all_sum[y] += t
+          all_sum[x] -= all_sum_y + t
+          one_sum[x] -= one_sum[y]
+
+  def same(self, u: int, v: int) -> bool:
+    return self.uf.same(u, v)
+
+  def size(self, v: int) -> int:
+    return self.uf.size(v)
+
+  def group_count(self) -> int:
+    return self.uf.group_count()
+
+  def add_point(self, v: int, x: int) -> None:
+    self.uf.add_point(v, x)
+
+  def add_group(self, v: int, x: int) -> None:
+    self.uf.add_group(v, x)
+
+  def group_sum(self, v: int) -> int:
+    return self.uf.group_sum(v)
 
   def __repr__(self):
     return f'OfflineDynamicConnectivity({self._n})'
 
+
+if __name__ == '__main__':
+  # n=10^5, q=3*10^5 のランダムなクエリで run の時間を測る
+  import random
+  from time import time
+  random.seed(1)
+  n, q = 10**5, 3*10**5
+  dc = OfflineDynamicConnectivity(n)
+  query = []
+  alive = []
+  for _ in range(q):
+    r = random.random()
+    if r < 0.4 or not alive:
+      u, v = random.randrange(n), random.randrange(n)
+      dc.add_edge(u, v)
+      alive.append((u, v))
+      query.append(-1)
+    elif r < 0.7:
+      i = random.randrange(len(alive))
+      alive[i], alive[-1] = alive[-1], alive[i]
+      dc.delete_edge(*alive.pop())
+      query.append(-1)
+    else:
+      dc.add_relax()
+      query.append(random.randrange(n))
+  ans = []
+  def out(k: int) -> None:
+    if query[k] >= 0:
+      ans.append(dc.size(query[k]))
+
+  start = time()
+  dc.run(out)
+  print(f'run: {time() - start:.3f}s, {len(ans)} queries')
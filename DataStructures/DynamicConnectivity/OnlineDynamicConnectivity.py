@@ -0,0 +1,294 @@
+from typing import List, Tuple
+from array import array
+
+class OnlineDynamicConnectivity():
+
+  # Holm–de Lichtenberg–Thorup
+  # 辺の追加・削除・連結判定をオンラインで, 償却O(log^2N)
+  # 各辺はレベルをもち、レベルi以上の木辺からなる全域森F_iをEulerTourTreeで管理する
+
+  class EulerTourTree():
+
+    # 全レベル分の森をまとめて持つ, 配列ベースのsplay木によるEulerTourTree
+    # ノード0は番兵, レベルiの頂点vのノードは 1+i*n+v, 辺のノードはその後ろ
+    # own/aggのビット 1: レベルiの木辺(を表す片方の向きのノード), 2: レベルiの非木辺をもつ頂点
+
+    def __init__(self, n: int, level: int):
+      self.n = n
+      m = 1 + n * level
+      self.left = array('i', bytes(4*m))
+      self.right = array('i', bytes(4*m))
+      self.par = array('i', bytes(4*m))
+      self.sz = array('i', [1]) * m
+      self.sz[0] = 0
+      self.isv = array('b', [1]) * m
+      self.isv[0] = 0
+      self.own = array('b', bytes(m))
+      self.agg = array('b', bytes(m))
+      # 辺ノードについて、その向き(u, v)
+      self.arc_u = array('i', bytes(4*m))
+      self.arc_v = array('i', bytes(4*m))
+      self.arc = [{} for _ in range(level)]
+      self.free = []
+
+    def _new_node(self, u: int, v: int) -> int:
+      if self.free:
+        x = self.free.pop()
+        self.arc_u[x] = u
+        self.arc_v[x] = v
+        return x
+      x = len(self.sz)
+      for a in (self.left, self.right, self.par):
+        a.append(0)
+      self.sz.append(0)
+      self.isv.append(0)
+      self.own.append(0)
+      self.agg.append(0)
+      self.arc_u.append(u)
+      self.arc_v.append(v)
+      return x
+
+    def _update(self, x: int) -> None:
+      l, r = self.left[x], self.right[x]
+      self.sz[x] = self.sz[l] + self.sz[r] + self.isv[x]
+      self.agg[x] = self.own[x] | self.agg[l] | self.agg[r]
+
+    def _rotate(self, x: int) -> None:
+      left, right, par = self.left, self.right, self.par
+      p = par[x]
+      g = par[p]
+      if left[p] == x:
+        b = right[x]
+        left[p] = b
+        right[x] = p
+      else:
+        b = left[x]
+        right[p] = b
+        left[x] = p
+      if b:
+        par[b] = p
+      par[p] = x
+      par[x] = g
+      if g:
+        if left[g] == p:
+          left[g] = x
+        else:
+          right[g] = x
+      self._update(p)
+      self._update(x)
+
+    def _splay(self, x: int) -> None:
+      left, par = self.left, self.par
+      while par[x]:
+        p = par[x]
+        g = par[p]
+        if g:
+          self._rotate(p if (left[g] == p) == (left[p] == x) else x)
+        self._rotate(x)
+
+    def _merge(self, a: int, b: int) -> int:
+      if not a: return b
+      if not b: return a
+      right = self.right
+      while right[a]:
+        a = right[a]
+      self._splay(a)
+      right[a] = b
+      self.par[b] = a
+      self._update(a)
+      return a
+
+    def _split_before(self, x: int) -> Tuple[int, int]:
+      self._splay(x)
+      l = self.left[x]
+      if l:
+        self.par[l] = 0
+        self.left[x] = 0
+        self._update(x)
+      return l, x
+
+    def _split_after(self, x: int) -> Tuple[int, int]:
+      self._splay(x)
+      r = self.right[x]
+      if r:
+        self.par[r] = 0
+        self.right[x] = 0
+        self._update(x)
+      return x, r
+
+    def vnode(self, i: int, v: int) -> int:
+      return 1 + i * self.n + v
+
+    def reroot(self, i: int, v: int) -> None:
+      l, r = self._split_before(self.vnode(i, v))
+      self._merge(r, l)
+
+    def connected(self, i: int, u: int, v: int) -> bool:
+      if u == v: return True
+      x, y = self.vnode(i, u), self.vnode(i, v)
+      self._splay(x)
+      self._splay(y)
+      return self.par[x] != 0
+
+    def size(self, i: int, v: int) -> int:
+      x = self.vnode(i, v)
+      self._splay(x)
+      return self.sz[x]
+
+    def link(self, i: int, u: int, v: int, mark: bool) -> None:
+      n = self.n
+      self.reroot(i, u)
+      self.reroot(i, v)
+      uv = self._new_node(u, v)
+      vu = self._new_node(v, u)
+      self.arc[i][u*n+v] = uv
+      self.arc[i][v*n+u] = vu
+      if mark:
+        self.own[uv] = 1
+      self._update(uv)
+      self._update(vu)
+      xu, xv = self.vnode(i, u), self.vnode(i, v)
+      self._splay(xu)
+      self._splay(xv)
+      self._merge(self._merge(self._merge(xu, uv), xv), vu)
+
+    def cut(self, i: int, u: int, v: int) -> None:
+      n = self.n
+      uv = self.arc[i].pop(u*n+v)
+      vu = self.arc[i].pop(v*n+u)
+      self.reroot(i, u)
+      a, m = self._split_before(uv)
+      m, c = self._split_after(vu)
+      _, m = self._split_after(uv)
+      self._split_before(vu)
+      self._merge(a, c)
+      for x in (uv, vu):
+        self.left[x] = self.right[x] = self.par[x] = 0
+        self.own[x] = self.agg[x] = 0
+        self.free.append(x)
+
+    def set_own(self, x: int, bit: int, flag: bool) -> None:
+      self._splay(x)
+      if flag:
+        self.own[x] |= bit
+      else:
+        self.own[x] &= ~bit
+      self._update(x)
+
+    def find(self, i: int, v: int, bit: int) -> int:
+      # vを含む木の中でownにbitをもつノードを1つ返す. なければ0
+      x = self.vnode(i, v)
+      self._splay(x)
+      own, agg, left, right = self.own, self.agg, self.left, self.right
+      if not agg[x] & bit:
+        return 0
+      while not own[x] & bit:
+        x = left[x] if agg[left[x]] & bit else right[x]
+      self._splay(x)
+      return x
+
+
+  def __init__(self, n: int):
+    self._n = n
+    self._level = n.bit_length() + 1
+    self._ett = OnlineDynamicConnectivity.EulerTourTree(n, self._level)
+    # 辺(u<v) -> レベル
+    self._edge_level = {}
+    self._tree = set()
+    self._adj = [{} for _ in range(self._level)]
+    self._group_count = n
+
+  def _key(self, u: int, v: int) -> int:
+    return u * self._n + v if u < v else v * self._n + u
+
+  def _add_nontree(self, i: int, u: int, v: int) -> None:
+    ett, adj = self._ett, self._adj[i]
+    for a, b in ((u, v), (v, u)):
+      s = adj.get(a)
+      if s is None:
+        s = adj[a] = set()
+      if not s:
+        ett.set_own(ett.vnode(i, a), 2, True)
+      s.add(b)
+
+  def _remove_nontree(self, i: int, u: int, v: int) -> None:
+    ett, adj = self._ett, self._adj[i]
+    for a, b in ((u, v), (v, u)):
+      s = adj[a]
+      s.discard(b)
+      if not s:
+        ett.set_own(ett.vnode(i, a), 2, False)
+
+  def add_edge(self, u: int, v: int) -> bool:
+    '''辺{u, v}を追加する. すでにあるか自己ループならFalse. / 償却O(log^2N)'''
+    assert 0 <= u < self._n and 0 <= v < self._n
+    if u == v: return False
+    k = self._key(u, v)
+    if k in self._edge_level: return False
+    self._edge_level[k] = 0
+    if self._ett.connected(0, u, v):
+      self._add_nontree(0, u, v)
+    else:
+      self._tree.add(k)
+      self._ett.link(0, u, v, True)
+      self._group_count -= 1
+    return True
+
+  def delete_edge(self, u: int, v: int) -> bool:
+    '''辺{u, v}を削除する. なければFalse. / 償却O(log^2N)'''
+    assert 0 <= u < self._n and 0 <= v < self._n
+    k = self._key(u, v)
+    if k not in self._edge_level: return False
+    lv = self._edge_level.pop(k)
+    if k not in self._tree:
+      self._remove_nontree(lv, u, v)
+      return True
+    self._tree.discard(k)
+    ett, n = self._ett, self._n
+    for i in range(lv+1):
+      ett.cut(i, u, v)
+    for i in range(lv, -1, -1):
+      if ett.size(i, u) > ett.size(i, v):
+        u, v = v, u
+      # uの側の木のレベルiの木辺をレベルi+1に上げる
+      while True:
+        x = ett.find(i, u, 1)
+        if not x: break
+        a, b = ett.arc_u[x], ett.arc_v[x]
+        ett.set_own(x, 1, False)
+        self._edge_level[self._key(a, b)] = i + 1
+        ett.link(i+1, a, b, True)
+      # uの側の木のレベルiの非木辺から代わりの辺を探す
+      adj = self._adj[i]
+      while True:
+        x = ett.find(i, u, 2)
+        if not x: break
+        a = x - 1 - i * n
+        for b in list(adj[a]):
+          self._remove_nontree(i, a, b)
+          if ett.connected(i, b, v):
+            kk = self._key(a, b)
+            self._tree.add(kk)
+            for j in range(i):
+              ett.link(j, a, b, False)
+            ett.link(i, a, b, True)
+            return True
+          self._edge_level[self._key(a, b)] = i + 1
+          self._add_nontree(i+1, a, b)
+    self._group_count += 1
+    return True
+
+  def same(self, u: int, v: int) -> bool:
+    '''uとvが連結かどうか. / 償却O(logN)'''
+    return self._ett.connected(0, u, v)
+
+  def size(self, v: int) -> int:
+    '''vを含む連結成分の頂点数. / 償却O(logN)'''
+    return self._ett.size(0, v)
+
+  def group_count(self) -> int:
+    return self._group_count
+
+  def __repr__(self):
+    return f'OnlineDynamicConnectivity({self._n})'
+
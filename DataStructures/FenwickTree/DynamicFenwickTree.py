@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Optional, Tuple
 
 class DynamicFenwickTree():
 
@@ -71,3 +71,231 @@ class DynamicFenwickTree():
   def __str__(self):
     return str(self._tree)
 
+# ---------------------- #
+
+from array import array
+
+class BlockedDynamicFenwickTree():
+
+  # [0, u) の動的FenwickTree. 2^b要素のarray('q')のブロックを、触ったときに確保する
+  # 段lのブロックcは、段l-1のブロック[c*2^b, (c+1)*2^b)の和を要素にもつ. 段数はu < 2^(b*段数)となる最小
+  # add, prefは各段でブロック内のFenwickTreeを1回ずつ辿るだけなので、ブロックを引くのは段数回で済む
+  # ブロックcの場所は、上位ビットc>>DIR_BITSのlist -> 下位ビットのarray('i') の2段のディレクトリで引く
+  # 上位のlistの大きさがTOP_LIMITを超える段だけ、c -> 場所 のdictにする(ハッシュを使う)
+  # 段lがlistになるのは u <= 2^(b*(l+1)+DIR_BITS) * TOP_LIMIT のとき. 既定のbでは u <= 2^30 ならすべての段でハッシュなし
+  # それより大きいuでは下の段からdictになる(u=10^18なら12段中7段). 疎なuで多段のlistにすると、キーごとにページを確保してメモリが持たない
+
+  DIR_BITS = 8
+  TOP_LIMIT = 1 << 16
+
+  def __init__(self, u: int, block_bits: int=0):
+    '''Build BlockedDynamicFenwickTree [0, u). / O(u/2^(b+DIR_BITS))'''
+    assert isinstance(u, int), \
+        f'TypeError: BlockedDynamicFenwickTree({u}), {u} must be int'
+    if block_bits <= 0:
+      block_bits = 6 if u <= 1 << 32 else 5
+    self._u = u
+    self._b = block_bits
+    self._B = 1 << block_bits
+    self._mask = self._B - 1
+    level = 1
+    while u >= 1 << (block_bits*level):
+      level += 1
+    self._level = level
+    self._data = [array('q') for _ in range(level)]
+    self._dir = []
+    for l in range(level):
+      m = ((max(u, 1) - 1) >> (block_bits*(l+1)) >> self.DIR_BITS) + 1
+      self._dir.append([None] * m if m <= self.TOP_LIMIT else {})
+
+  def _find(self, l: int, c: int) -> int:
+    # 段lのブロックcの先頭の添字. なければ-1
+    top = self._dir[l]
+    if type(top) is dict:
+      s = top.get(c, -1)
+    else:
+      h = c >> self.DIR_BITS
+      sub = top[h] if h < len(top) else None
+      s = -1 if sub is None else sub[c & ((1 << self.DIR_BITS) - 1)]
+    return -1 if s < 0 else s << self._b
+
+  def _alloc(self, l: int, c: int) -> int:
+    data = self._data[l]
+    s = len(data) >> self._b
+    data.frombytes(bytes(8*self._B))
+    top = self._dir[l]
+    if type(top) is dict:
+      top[c] = s
+    else:
+      h = c >> self.DIR_BITS
+      if top[h] is None:
+        top[h] = array('i', [-1]) * (1 << self.DIR_BITS)
+      top[h][c & ((1 << self.DIR_BITS) - 1)] = s
+    return s << self._b
+
+  def add(self, k: int, x: int) -> None:
+    '''Add x to a[k]. / O(log(u)/b * (b+1))'''
+    assert 0 <= k < self._u, \
+        f'IndexError: BlockedDynamicFenwickTree.add({k}, {x}), u={self._u}'
+    b, B, mask, data, dirs = self._b, self._B, self._mask, self._data, self._dir
+    db = self.DIR_BITS
+    dmask = (1 << db) - 1
+    for l in range(self._level):
+      c = k >> b
+      top = dirs[l]
+      if type(top) is dict:
+        s = top.get(c, -1)
+      else:
+        sub = top[c >> db]
+        s = -1 if sub is None else sub[c & dmask]
+      o = self._alloc(l, c) if s < 0 else s << b
+      d = data[l]
+      j = (k & mask) + 1
+      while j <= B:
+        d[o+j-1] += x
+        j += j & -j
+      k = c
+
+  def pref(self, r: int) -> int:
+    '''Return sum(a[0, r)). / O(log(u)/b * (b+1))'''
+    assert 0 <= r <= self._u, \
+        f'IndexError: BlockedDynamicFenwickTree.pref({r}), u={self._u}'
+    b, mask, data, dirs = self._b, self._mask, self._data, self._dir
+    db = self.DIR_BITS
+    dmask = (1 << db) - 1
+    res = 0
+    for l in range(self._level):
+      c = r >> b
+      j = r & mask
+      if j:
+        top = dirs[l]
+        if type(top) is dict:
+          s = top.get(c, -1)
+        else:
+          sub = top[c >> db]
+          s = -1 if sub is None else sub[c & dmask]
+        if s >= 0:
+          o = s << b
+          d = data[l]
+          while j:
+            res += d[o+j-1]
+            j &= j - 1
+      r = c
+    return res
+
+  def sum(self, l: int, r: int) -> int:
+    '''Return sum(a[l, r)). / O(log(u)/b * (b+1))'''
+    assert 0 <= l <= r <= self._u, \
+        f'IndexError: BlockedDynamicFenwickTree.sum({l}, {r}), u={self._u}'
+    return self.pref(r) - self.pref(l)
+
+  def _descend(self, w: int, strict: bool) -> Tuple[int, int]:
+    # 上の段から、ブロック内のFenwickTreeを二分探索で降りる
+    b, B, data = self._b, self._B, self._data
+    c = 0
+    for l in range(self._level-1, -1, -1):
+      o = self._find(l, c)
+      p = 0
+      if o < 0:
+        if (0 < w) if strict else (0 <= w):
+          p = B
+      else:
+        d = data[l]
+        t = d[o+B-1]
+        if (t < w) if strict else (t <= w):
+          w -= t
+          p = B
+        else:
+          s = B >> 1
+          while s:
+            t = d[o+p+s-1]
+            if (t < w) if strict else (t <= w):
+              w -= t
+              p += s
+            s >>= 1
+      c = (c << b) + p
+    return min(c, self._u), w
+
+  def bisect_left(self, w: int) -> Optional[int]:
+    '''bisect_left(acc) / O(log(u)/b * (b+1))'''
+    i, w = self._descend(w, True)
+    return i if w else None
+
+  def bisect_right(self, w: int) -> int:
+    '''bisect_right(acc) / O(log(u)/b * (b+1))'''
+    return self._descend(w, False)[0]
+
+  def compact(self) -> None:
+    '''要素がすべて0のブロックを捨てて詰め直す. / O(確保済みの大きさ)'''
+    b, B = self._b, self._B
+    for l in range(self._level):
+      data = self._data[l]
+      top = self._dir[l]
+      new = array('q')
+      if type(top) is dict:
+        for c, s in list(top.items()):
+          block = data[s<<b:(s+1)<<b]
+          if any(block):
+            top[c] = len(new) >> b
+            new.extend(block)
+          else:
+            del top[c]
+      else:
+        for h, sub in enumerate(top):
+          if sub is None: continue
+          alive = False
+          for i in range(len(sub)):
+            s = sub[i]
+            if s < 0: continue
+            block = data[s<<b:(s+1)<<b]
+            if any(block):
+              sub[i] = len(new) >> b
+              new.extend(block)
+              alive = True
+            else:
+              sub[i] = -1
+          if not alive:
+            top[h] = None
+      self._data[l] = new
+
+  def block_count(self) -> int:
+    '''確保しているブロックの個数'''
+    return sum(len(d) for d in self._data) >> self._b
+
+  def __str__(self):
+    return f'BlockedDynamicFenwickTree({self._u}, blocks={self.block_count()})'
+
+if __name__ == '__main__':
+  # dict版との比較
+  from time import time
+  import random
+
+  def bench(u, ks, block_bits=0):
+    xs = [random.randint(1, 10) for _ in ks]
+    rs = [random.randint(0, u) for _ in ks]
+    res = []
+    for fw in (DynamicFenwickTree(u), BlockedDynamicFenwickTree(u, block_bits)):
+      start = time()
+      for k, x in zip(ks, xs):
+        fw.add(k, x)
+      t_add = time() - start
+      start = time()
+      s = 0
+      for r in rs:
+        s += fw.pref(r)
+      t_pref = time() - start
+      start = time()
+      for r in rs[:len(rs)>>2]:
+        fw.bisect_left(r & 0xffff)
+      t_bisect = time() - start
+      res.append((t_add, t_pref, t_bisect, s))
+    (a0, p0, b0, s0), (a1, p1, b1, s1) = res
+    assert s0 == s1
+    print(f'u={u}, q={len(ks)}')
+    print(f'  dict   : add {a0:.3f}s, pref {p0:.3f}s, bisect {b0:.3f}s')
+    print(f'  blocked: add {a1:.3f}s, pref {p1:.3f}s, bisect {b1:.3f}s')
+
+  random.seed(0)
+  q = 2 * 10**5
+  bench(10**18, [random.randrange(10**18) for _ in range(q)])
+  bench(10**7, [random.randrange(10**7) for _ in range(q)])
@@ -1,20 +1,38 @@
-from typing import List, Union, Iterable, Optional
+from typing import List, Union, Iterable, Optional, Sequence
+from array import array
 
 class FenwickTree():
 
+  # 値はarray('q')で持つので、和は64bitに収まること
+
   def __init__(self, _n_or_a: Union[Iterable[int], int]):
+    '''O(N)'''
     if isinstance(_n_or_a, int):
       self._size = _n_or_a
-      self._tree = [0] * (self._size + 1)
+      self._tree = array('q', bytes(8*(self._size + 1)))
     else:
-      a = _n_or_a if isinstance(_n_or_a, list) else list(_n_or_a)
-      self._size = len(a)
-      self._tree = [0] + a
-      for i in range(1, self._size):
-        if i + (i & -i) <= self._size:
-          self._tree[i + (i & -i)] += self._tree[i]
+      self._tree = array('q', [0])
+      self._tree.extend(_n_or_a)
+      self._size = len(self._tree) - 1
+      self._build()
     self._s = 1 << (self._size - 1).bit_length()
 
+  def _build(self) -> None:
+    # _treeに生の値が入っている状態からO(N)で構築する
+    _tree, _size = self._tree, self._size
+    for i in range(1, _size):
+      j = i + (i & -i)
+      if j <= _size:
+        _tree[j] += _tree[i]
+
+  def _unbuild(self) -> None:
+    # _buildの逆. _treeを生の値に戻す. O(N)
+    _tree, _size = self._tree, self._size
+    for i in range(_size-1, 0, -1):
+      j = i + (i & -i)
+      if j <= _size:
+        _tree[j] -= _tree[i]
+
   def pref(self, r: int) -> int:
     '''Return sum(a[0, r)) / O(logN)'''
     assert 0 <= r <= self._size, \
@@ -25,6 +43,29 @@ class FenwickTree():
       r &= r - 1
     return ret
 
+  def pref_many(self, rs: Sequence[int]) -> List[int]:
+    '''
+    昇順に並んだrsについて[pref(r) for r in rs]を返す
+    隣り合うr同士の差分だけを足すので、rが密ならpref1回あたりO(log(差))
+    '''
+    _tree, _size = self._tree, self._size
+    res = []
+    pre = 0
+    acc = 0
+    for r in rs:
+      assert pre <= r <= _size, \
+          f'IndexError: FenwickTree.pref_many, {r} (prev={pre}), n={_size}'
+      l = pre
+      pre = r
+      while r > l:
+        acc += _tree[r]
+        r &= r - 1
+      while l > r:
+        acc -= _tree[l]
+        l &= l - 1
+      res.append(acc)
+    return res
+
   def suff(self, l: int) -> int:
     '''Return sum(a[l, n)). / O(logN)'''
     assert 0 <= l < self._size, \
@@ -61,6 +102,26 @@ class FenwickTree():
       _tree[k] += x
       k += k & -k
 
+  def add_many(self, ks: Sequence[int], xs: Sequence[int]) -> None:
+    '''各iについてa[ks[i]]にxs[i]を足す. 個数が多いときは作り直す / O(min(KlogN, N+K))'''
+    assert len(ks) == len(xs)
+    _size, _tree = self._size, self._tree
+    if len(ks) * _size.bit_length() > 2 * _size:
+      self._unbuild()
+      for k, x in zip(ks, xs):
+        assert 0 <= k < _size, \
+            f'IndexError: FenwickTree.add_many, {k}, n={_size}'
+        _tree[k+1] += x
+      self._build()
+      return
+    for k, x in zip(ks, xs):
+      assert 0 <= k < _size, \
+          f'IndexError: FenwickTree.add_many, {k}, n={_size}'
+      k += 1
+      while k <= _size:
+        _tree[k] += x
+        k += k & -k
+
   def __setitem__(self, k: int, x: int):
     '''Update A[k] to x. / O(logN)'''
     assert -self._size <= k < self._size, \
@@ -94,8 +155,13 @@ class FenwickTree():
     print('[' + ', '.join(map(str, (self.pref(i) for i in range(self._size+1)))) + ']')
 
   def tolist(self) -> List[int]:
-    sub = [self.pref(i) for i in range(self._size+1)]
-    return [sub[i+1]-sub[i] for i in range(self._size)]
+    '''O(N)'''
+    a = self._tree[:]
+    for i in range(self._size-1, 0, -1):
+      j = i + (i & -i)
+      if j <= self._size:
+        a[j] -= a[i]
+    return a.tolist()[1:]
 
   @staticmethod
   def get_inversion_num(a: List[int], compress: bool=False) -> int:
@@ -114,6 +180,36 @@ class FenwickTree():
         fw.add(e, 1)
     return inv
 
+  @staticmethod
+  def inversion_count(a: Sequence) -> int:
+    '''i < j かつ a[i] > a[j] である(i, j)の個数を返す. 比較できれば何でもよい / O(NlogN)'''
+    # ボトムアップのマージソート
+    a = list(a)
+    n = len(a)
+    b = [None] * n
+    inv = 0
+    w = 1
+    while w < n:
+      for lo in range(0, n, w<<1):
+        mid = min(lo+w, n)
+        hi = min(lo+(w<<1), n)
+        i, j, k = lo, mid, lo
+        while i < mid and j < hi:
+          if a[j] < a[i]:
+            b[k] = a[j]
+            inv += mid - i
+            j += 1
+          else:
+            b[k] = a[i]
+            i += 1
+          k += 1
+        b[k:k+mid-i] = a[i:mid]
+        k += mid - i
+        b[k:k+hi-j] = a[j:hi]
+      a, b = b, a
+      w <<= 1
+    return inv
+
   def __str__(self):
     return str(self.tolist())
 
@@ -1,22 +1,39 @@
 from typing import List, Iterable, Union
+from array import array
 
 class FenwickTreeRAQ():
 
+  # 値はarray('q')で持つので、x*nの大きさまで64bitに収まること
+
   def __init__(self, n_or_a: Union[Iterable[int], int]):
+    '''O(N)'''
     if isinstance(n_or_a, int):
       self.n = n_or_a
-      self.bit0 = [0] * (n_or_a + 2)
-      self.bit1 = [0] * (n_or_a + 2)
+      self.bit0 = array('q', bytes(8*(n_or_a + 2)))
+      self.bit1 = array('q', bytes(8*(n_or_a + 2)))
       self.bit_size = self.n + 1
     else:
       if not hasattr(n_or_a, '__len__'):
         n_or_a = list(n_or_a)
       self.n = len(n_or_a)
-      self.bit0 = [0] * (self.n + 2)
-      self.bit1 = [0] * (self.n + 2)
+      self.bit0 = array('q', bytes(8*(self.n + 2)))
+      self.bit1 = array('q', bytes(8*(self.n + 2)))
       self.bit_size = self.n + 1
-      for i, e in enumerate(n_or_a):
-        self.add_range(i, i+1, e)
+      self._build(n_or_a)
+
+  def _build(self, a: List[int]) -> None:
+    # add_range(i, i+1, a[i])をまとめて生の値として置いてから、O(N)で構築する
+    bit0, bit1, size = self.bit0, self.bit1, self.bit_size
+    for i, e in enumerate(a):
+      bit0[i+1] -= e * i
+      bit0[i+2] += e * (i+1)
+      bit1[i+1] += e
+      bit1[i+2] -= e
+    for bit in (bit0, bit1):
+      for i in range(1, size):
+        j = i + (i & -i)
+        if j <= size:
+          bit[j] += bit[i]
 
   def __add(self, bit: List[int], k: int, x: int) -> None:
     k += 1
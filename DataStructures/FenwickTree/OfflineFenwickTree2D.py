@@ -0,0 +1,135 @@
+from typing import List, Tuple
+from array import array
+from bisect import bisect_left
+
+class OfflineFenwickTree2D():
+
+  # 点の座標を先に与える2次元FenwickTree(点の重みは後から変更できる)
+  # xで座標圧縮したFenwickTreeの各ノードが、担当する点のyで座標圧縮したFenwickTreeをもつ
+  # 全ノードのFenwickTreeを1本のarray('q')に詰める. メモリO(NlogN)
+  # 重みの和は64bitに収まること
+
+  def __init__(self, points: List[Tuple[int, int]], a: List[int]=[]):
+    '''O(NlogN)'''
+    assert not a or len(a) == len(points)
+    xs = sorted(set(x for x, _ in points))
+    nx = len(xs)
+    xi = {x: i+1 for i, x in enumerate(xs)}
+    node_y = [[] for _ in range(nx+1)]
+    node_w = [[] for _ in range(nx+1)]
+    # yの昇順に点を見て、x方向のFenwickTreeの各ノードにyを積む(各ノードでyはソート済みになる)
+    for k in sorted(range(len(points)), key=lambda k: points[k][1]):
+      x, y = points[k]
+      w = a[k] if a else 0
+      i = xi[x]
+      while i <= nx:
+        ly = node_y[i]
+        if ly and ly[-1] == y:
+          node_w[i][-1] += w
+        else:
+          ly.append(y)
+          node_w[i].append(w)
+        i += i & -i
+    # ノードiのFenwickTreeは [start[i]+1, start[i+1]) (1-indexed)
+    start = array('i', bytes(4*(nx+2)))
+    for i in range(1, nx+1):
+      start[i+1] = start[i] + len(node_y[i]) + 1
+    ys = array('q', bytes(8*start[nx+1]))
+    tree = array('q', bytes(8*start[nx+1]))
+    for i in range(1, nx+1):
+      o = start[i]
+      L = len(node_y[i])
+      ys[o+1:o+L+1] = array('q', node_y[i])
+      tree[o+1:o+L+1] = array('q', node_w[i])
+      for p in range(1, L+1):
+        q = p + (p & -p)
+        if q <= L:
+          tree[o+q] += tree[o+p]
+    self._n = len(points)
+    self._nx = nx
+    self._xs = xs
+    self._xi = xi
+    self._start = start
+    self._ys = ys
+    self._tree = tree
+
+  def add(self, x: int, y: int, w: int) -> None:
+    '''Add w to point (x, y). (x, y)は登録済みの点であること / O(logN^2)'''
+    i = self._xi.get(x, 0)
+    nx, start, ys, tree = self._nx, self._start, self._ys, self._tree
+    assert i, f'IndexError: OfflineFenwickTree2D.add({x}, {y}, {w}), not registered'
+    while i <= nx:
+      o = start[i]
+      L = start[i+1] - o - 1
+      p = bisect_left(ys, y, o+1, o+L+1) - o
+      assert p <= L and ys[o+p] == y, \
+          f'IndexError: OfflineFenwickTree2D.add({x}, {y}, {w}), not registered'
+      while p <= L:
+        tree[o+p] += w
+        p += p & -p
+      i += i & -i
+
+  def set(self, x: int, y: int, w: int) -> None:
+    self.add(x, y, w - self.get(x, y))
+
+  def _sum(self, i1: int, i2: int, y1: int, y2: int) -> int:
+    # xの順位が[i1, i2), yが[y1, y2)の点の重みの和
+    start, ys, tree = self._start, self._ys, self._tree
+    res = 0
+    while i2 > i1:
+      o, e = start[i2], start[i2+1]
+      p = bisect_left(ys, y2, o+1, e) - o - 1
+      q = bisect_left(ys, y1, o+1, e) - o - 1
+      while p > q:
+        res += tree[o+p]
+        p -= p & -p
+      while q > p:
+        res -= tree[o+q]
+        q -= q & -q
+      i2 -= i2 & -i2
+    while i1 > i2:
+      o, e = start[i1], start[i1+1]
+      p = bisect_left(ys, y2, o+1, e) - o - 1
+      q = bisect_left(ys, y1, o+1, e) - o - 1
+      while p > q:
+        res -= tree[o+p]
+        p -= p & -p
+      while q > p:
+        res += tree[o+q]
+        q -= q & -q
+      i1 -= i1 & -i1
+    return res
+
+  def sum(self, x1: int, y1: int, x2: int, y2: int) -> int:
+    '''Return sum of points in [x1, x2) x [y1, y2). / O(logN^2)'''
+    assert x1 <= x2 and y1 <= y2, \
+        f'IndexError: OfflineFenwickTree2D.sum({x1}, {y1}, {x2}, {y2})'
+    return self._sum(bisect_left(self._xs, x1), bisect_left(self._xs, x2), y1, y2)
+
+  def sum_many(self, queries: List[Tuple[int, int, int, int]]) -> List[int]:
+    '''
+    各(x1, y1, x2, y2)について sum(x1, y1, x2, y2) を返す
+    xの順位でソートしてから処理し、近いノードを続けて触るようにする / O(QlogN^2)
+    '''
+    xs = self._xs
+    qs = []
+    for k, (x1, y1, x2, y2) in enumerate(queries):
+      assert x1 <= x2 and y1 <= y2, \
+          f'IndexError: OfflineFenwickTree2D.sum_many, query {k}: ({x1}, {y1}, {x2}, {y2})'
+      qs.append((bisect_left(xs, x2), bisect_left(xs, x1), y1, y2, k))
+    qs.sort()
+    res = [0] * len(qs)
+    _sum = self._sum
+    for i2, i1, y1, y2, k in qs:
+      res[k] = _sum(i1, i2, y1, y2)
+    return res
+
+  def get(self, x: int, y: int) -> int:
+    return self.sum(x, y, x+1, y+1)
+
+  def __len__(self):
+    return self._n
+
+  def __repr__(self):
+    return f'OfflineFenwickTree2D({self._n})'
+
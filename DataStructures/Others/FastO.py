@@ -4,24 +4,45 @@ from __pypy__.builders import StringBuilder
 class FastO():
 
   sb = StringBuilder()
+  size = 0
+  # 溜めた出力がこの文字数を超えたらflushする
+  FLUSH_THRESHOLD = 1<<20
 
   @classmethod
   def write(cls, *args, sep: str=' ', end: str='\n', flush: bool=False) -> None:
     append = cls.sb.append
+    size = len(end)
     for i in range(len(args)-1):
-      append(str(args[i]))
+      t = str(args[i])
+      append(t)
       append(sep)
+      size += len(t) + len(sep)
     if args:
-      append(str(args[-1]))
+      t = str(args[-1])
+      append(t)
+      size += len(t)
     append(end)
-    if flush:
+    cls.size += size
+    if flush or cls.size >= cls.FLUSH_THRESHOLD:
+      cls.flush()
+
+  @classmethod
+  def write_ints(cls, a, sep: str=' ', end: str='\n', flush: bool=False) -> None:
+    '''整数の列aをsep区切りで1回のjoinで書き込む'''
+    t = sep.join(map(str, a))
+    cls.sb.append(t)
+    cls.sb.append(end)
+    cls.size += len(t) + len(end)
+    if flush or cls.size >= cls.FLUSH_THRESHOLD:
       cls.flush()
 
   @classmethod
   def flush(cls) -> None:
     os.write(1, cls.sb.build().encode())
     cls.sb = StringBuilder()
+    cls.size = 0
 
 write = FastO.write
+write_ints = FastO.write_ints
 flush = FastO.flush
 
@@ -0,0 +1,147 @@
+from typing import Generic, TypeVar, Iterable, Callable, Sequence, List
+T = TypeVar('T')
+
+class DisjointSparseTable(Generic[T]):
+
+  # 結合的なopならなんでもよい(冪等・逆元は不要). 構築O(NlogN), prod O(1)
+  # 段kでは長さ2^(k+1)の区間の中点から左右に累積を取る. 全段を1本のlistに詰める
+
+  def __init__(self, a: Iterable[T], op: Callable[[T, T], T], e: T=None):
+    if not isinstance(a, Sequence):
+      a = list(a)
+    n = len(a)
+    log = max(1, (n-1).bit_length())
+    data = [e] * (n * log)
+    data[:n] = a
+    for k in range(1, log):
+      o = k * n
+      w = 1 << k
+      for m in range(w, n, w<<1):
+        # 左側: [i, m), 右側: [m, i]
+        data[o+m-1] = a[m-1]
+        for i in range(m-2, m-w-1, -1):
+          data[o+i] = op(a[i], data[o+i+1])
+        data[o+m] = a[m]
+        for i in range(m+1, min(m+w, n)):
+          data[o+i] = op(data[o+i-1], a[i])
+    self.size = n
+    self.data = data
+    self.op = op
+    self.e = e
+
+  def prod(self, l: int, r: int) -> T:
+    '''Return op(a[l, r)). / O(1)'''
+    assert 0 <= l <= r <= self.size, \
+        f'IndexError: DisjointSparseTable.prod({l}, {r}), len={self.size}'
+    if l == r: return self.e
+    r -= 1
+    if l == r: return self.data[l]
+    o = ((l ^ r).bit_length() - 1) * self.size
+    return self.op(self.data[o+l], self.data[o+r])
+
+  def prod_many(self, ls: Sequence[int], rs: Sequence[int]) -> List[T]:
+    '''[prod(l, r) for l, r in zip(ls, rs)]を返す. / O(Q)'''
+    assert len(ls) == len(rs)
+    n, data, op, e = self.size, self.data, self.op, self.e
+    res = []
+    for l, r in zip(ls, rs):
+      assert 0 <= l <= r <= n, \
+          f'IndexError: DisjointSparseTable.prod_many, ({l}, {r}), len={n}'
+      r -= 1
+      if l > r:
+        res.append(e)
+      elif l == r:
+        res.append(data[l])
+      else:
+        o = ((l ^ r).bit_length() - 1) * n
+        res.append(op(data[o+l], data[o+r]))
+    return res
+
+  def __getitem__(self, k: int) -> T:
+    assert 0 <= k < self.size, \
+        f'IndexError: DisjointSparseTable.__getitem__({k}), len={self.size}'
+    return self.data[k]
+
+  def __len__(self):
+    return self.size
+
+  def __str__(self):
+    return str(self.data[:self.size])
+
+  def __repr__(self):
+    return f'DisjointSparseTable({self}, {self.op}, {self.e})'
+
+# ---------------------- #
+
+class BlockedDisjointSparseTable(Generic[T]):
+
+  # DisjointSparseTableの省メモリ版. 長さBのブロックに分け、
+  # ブロック内の累積(前から・後ろから)と、ブロックの総積のDisjointSparseTableをもつ. メモリO(N + N/B log(N/B))
+  # 異なるブロックにまたがるprodはop2回でO(1), 1つのブロックに収まるprodはO(B)
+
+  def __init__(self, a: Iterable[T], op: Callable[[T, T], T], e: T=None, block_size: int=16):
+    if not isinstance(a, Sequence):
+      a = list(a)
+    n = len(a)
+    B = max(1, block_size)
+    pre = list(a)
+    suf = list(a)
+    tot = []
+    for s in range(0, n, B):
+      t = min(s+B, n)
+      for i in range(s+1, t):
+        pre[i] = op(pre[i-1], a[i])
+      for i in range(t-2, s-1, -1):
+        suf[i] = op(a[i], suf[i+1])
+      tot.append(pre[t-1])
+    self.size = n
+    self.a = a
+    self.B = B
+    self.pre = pre
+    self.suf = suf
+    self.table = DisjointSparseTable(tot, op, e)
+    self.op = op
+    self.e = e
+
+  def prod(self, l: int, r: int) -> T:
+    '''Return op(a[l, r)). / O(1) (同じブロック内ならO(B))'''
+    assert 0 <= l <= r <= self.size, \
+        f'IndexError: BlockedDisjointSparseTable.prod({l}, {r}), len={self.size}'
+    if l == r: return self.e
+    B, op = self.B, self.op
+    bl, br = l // B, (r-1) // B
+    if bl == br:
+      a = self.a
+      if r == (bl+1)*B or r == self.size:
+        return self.suf[l]
+      if l == bl*B:
+        return self.pre[r-1]
+      res = a[l]
+      for i in range(l+1, r):
+        res = op(res, a[i])
+      return res
+    res = self.suf[l]
+    if bl + 1 < br:
+      res = op(res, self.table.prod(bl+1, br))
+    return op(res, self.pre[r-1])
+
+  def prod_many(self, ls: Sequence[int], rs: Sequence[int]) -> List[T]:
+    '''[prod(l, r) for l, r in zip(ls, rs)]を返す'''
+    assert len(ls) == len(rs)
+    prod = self.prod
+    return [prod(l, r) for l, r in zip(ls, rs)]
+
+  def __getitem__(self, k: int) -> T:
+    assert 0 <= k < self.size, \
+        f'IndexError: BlockedDisjointSparseTable.__getitem__({k}), len={self.size}'
+    return self.a[k]
+
+  def __len__(self):
+    return self.size
+
+  def __str__(self):
+    return str(self.a)
+
+  def __repr__(self):
+    return f'BlockedDisjointSparseTable({self}, {self.op}, {self.e}, {self.B})'
+
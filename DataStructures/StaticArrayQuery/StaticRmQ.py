@@ -1,72 +1,124 @@
-from typing import List, Iterable
+from typing import List, Iterable, Callable, Optional, Sequence, Any
 from array import array
 
 class StaticRmQ():
 
-  class SparseTableRmQ():
+  # 構築O(N), 区間min/max/argmin/argmaxがO(1)
+  # 長さ64のブロックに分け、ブロック内は「各位置でのスタック(単調列)の位置集合」を64bitのマスクで、
+  # ブロック間はブロックごとの最適な位置のSparseTableでもつ
+  # mode: 'min', 'max' はその要素を、'argmin', 'argmax' はその位置(同じ値なら最も左)を返す
+  # key: 比較に使う値. 構築時に1回だけ適用する
 
-    def __init__(self, a: List[int], INF: int):
-      self.size = len(a)
+  MODES = ('min', 'max', 'argmin', 'argmax')
+
+  class SparseTableArg():
+
+    # 位置を持つSparseTable. 値が同じなら左を選ぶ
+
+    def __init__(self, idx: array, vals: Sequence, is_max: bool):
+      self.size = len(idx)
       log = self.size.bit_length()-1
-      self.data = [a] + [[]] * log
+      self.data = [idx] + [array('i')] * log
       for i in range(log):
         pre = self.data[i]
         l = 1 << i
-        self.data[i+1] = [min(pre[j], pre[j+l]) for j in range(len(pre)-l)]
-      self.INF = INF
+        if is_max:
+          self.data[i+1] = array('i', [pre[j+l] if vals[pre[j+l]] > vals[pre[j]] else pre[j] for j in range(len(pre)-l)])
+        else:
+          self.data[i+1] = array('i', [pre[j+l] if vals[pre[j+l]] < vals[pre[j]] else pre[j] for j in range(len(pre)-l)])
+      self.vals = vals
+      self.is_max = is_max
 
-    def prod(self, l: int, r: int) -> int:
-      if l >= r: return self.INF
+    def arg(self, l: int, r: int) -> int:
+      # l < r
       u = (r-l).bit_length()-1
-      return min(self.data[u][l], self.data[u][r-(1<<u)])
+      i, j = self.data[u][l], self.data[u][r-(1<<u)]
+      if self.is_max:
+        return j if self.vals[j] > self.vals[i] else i
+      return j if self.vals[j] < self.vals[i] else i
 
-  def __init__(self, a: Iterable[int], INF=10**9):
+  def __init__(self, a: Iterable[Any], INF=10**9, mode: str='min', key: Optional[Callable[[Any], Any]]=None):
+    assert mode in StaticRmQ.MODES, \
+        f'ValueError: StaticRmQ(mode={mode}), mode must be in {StaticRmQ.MODES}'
     a = list(a)
+    vals = a if key is None else [key(e) for e in a]
     n = len(a)
-    bucket_size = n.bit_length()//2 + 1
-    bucket_size = 31
-    bucket_cnt = (n + bucket_size - 1) // bucket_size
-    bucket = [a[bucket_size*i:bucket_size*(i+1)] for i in range(bucket_cnt)]
-    bucket_data = StaticRmQ.SparseTableRmQ([min(b) for b in bucket], INF)
-    bucket_bit = array('I', bytes(4*bucket_size*bucket_cnt))
+    is_max = mode == 'max' or mode == 'argmax'
+    bucket_size = 64
+    bucket_cnt = (n + bucket_size - 1) >> 6
+    bucket_bit = array('Q', bytes(8*n))
+    bucket_arg = array('i', bytes(4*bucket_cnt))
 
-    for i, b in enumerate(bucket):
+    for k in range(bucket_cnt):
+      s = k << 6
+      t = min(s+bucket_size, n)
       stack = []
-      for j, e in enumerate(b):
-        g = -1
-        while stack and b[stack[-1]] > e:
-          stack.pop()
+      for j in range(s, t):
+        e = vals[j]
+        if is_max:
+          while stack and vals[stack[-1]] < e:
+            stack.pop()
+        else:
+          while stack and vals[stack[-1]] > e:
+            stack.pop()
         if stack:
           g = stack[-1]
+          bucket_bit[j] = bucket_bit[g] | (1 << (g-s))
         stack.append(j)
-        if g == -1: continue
-        bucket_bit[i*bucket_size+j] = bucket_bit[i*bucket_size+g] | (1 << g)
+      bucket_arg[k] = stack[0]
     self.n = n
     self.INF = INF
+    self.mode = mode
+    self.a = a
+    self.vals = vals
+    self.is_max = is_max
     self.bucket_size = bucket_size
-    self.bucket_data = bucket_data
-    self.bucket = bucket
     self.bucket_bit = bucket_bit
+    self.bucket_data = StaticRmQ.SparseTableArg(bucket_arg, vals, is_max)
 
-  def prod(self, l: int, r: int) -> int:
+  def arg(self, l: int, r: int) -> int:
+    '''a[l, r)で最適な位置(同じ値なら最も左)を返す. 空なら-1 / O(1)'''
     assert 0 <= l <= r <= self.n, \
-        f'IndexError: StaticRmQ.prod({l}, {r}), n={self.n}'
-    if l == r:
-      return self.INF
-    k1 = l // self.bucket_size
-    k2 = r // self.bucket_size
-    l -= k1 * self.bucket_size
-    r -= k2 * self.bucket_size + 1
+        f'IndexError: StaticRmQ.arg({l}, {r}), n={self.n}'
+    if l == r: return -1
+    bucket_bit, vals = self.bucket_bit, self.vals
+    r -= 1
+    k1, k2 = l >> 6, r >> 6
     if k1 == k2:
-      bit = self.bucket_bit[k1*self.bucket_size+r] >> l
-      return self.bucket[k1][(bit&(-bit)).bit_length()+l-1 if bit else r]
-    ans = self.INF
-    if l < len(self.bucket[k1]):
-      bit = self.bucket_bit[k1*self.bucket_size+len(self.bucket[k1])-1] >> l
-      ans = self.bucket[k1][(bit&(-bit)).bit_length()+l-1 if bit else -1]
-    ans = min(ans, self.bucket_data.prod(k1+1, k2))
-    if r >= 0:
-      bit = self.bucket_bit[k2*self.bucket_size+r]
-      ans = min(ans, self.bucket[k2][(bit&(-bit)).bit_length()-1 if bit else r])
+      bit = bucket_bit[r] >> (l & 63)
+      return l + (bit & -bit).bit_length() - 1 if bit else r
+    e = (k1 << 6) | 63
+    bit = bucket_bit[e] >> (l & 63)
+    ans = l + (bit & -bit).bit_length() - 1 if bit else e
+    if k1 + 1 < k2:
+      i = self.bucket_data.arg(k1+1, k2)
+      if (vals[i] > vals[ans]) if self.is_max else (vals[i] < vals[ans]):
+        ans = i
+    bit = bucket_bit[r]
+    i = (k2 << 6) + (bit & -bit).bit_length() - 1 if bit else r
+    if (vals[i] > vals[ans]) if self.is_max else (vals[i] < vals[ans]):
+      ans = i
     return ans
 
+  def prod(self, l: int, r: int) -> Any:
+    '''modeに応じて、a[l, r)の最適な要素かその位置を返す. 空ならINFか-1 / O(1)'''
+    assert 0 <= l <= r <= self.n, \
+        f'IndexError: StaticRmQ.prod({l}, {r}), n={self.n}'
+    i = self.arg(l, r)
+    if self.mode[0] == 'a':
+      return i
+    return self.INF if i == -1 else self.a[i]
+
+  def prod_many(self, ls: Sequence[int], rs: Sequence[int]) -> List[Any]:
+    '''[prod(l, r) for l, r in zip(ls, rs)]を返す. / O(Q)'''
+    assert len(ls) == len(rs)
+    arg = self.arg
+    res = [arg(l, r) for l, r in zip(ls, rs)]
+    if self.mode[0] != 'a':
+      a, INF = self.a, self.INF
+      res = [INF if i == -1 else a[i] for i in res]
+    return res
+
+  def __len__(self):
+    return self.n
+
@@ -0,0 +1,72 @@
+from typing import List, Tuple, Sequence, Union, Optional
+from array import array
+from multiprocessing import get_context
+import os
+
+# UnionFind(DataStructures/UnionFind/UnionFind.py)が必要
+# 辺を分割して各プロセスでUnionFindをし、実際に併合した辺(全域森, 高々min(シャードの辺数, n-1)本)だけを返す
+# 親プロセスはそれらの辺をまとめてuniteするので、併合は全体でO(mα(n))
+
+_shards = None
+
+def _cc_worker(args) -> Tuple[array, array]:
+  idx, n, shard = args
+  us, vs = _shards[idx] if shard is None else shard
+  uf = UnionFind(n)
+  united = uf.unite_many(us, vs)
+  fu, fv = array('i'), array('i')
+  for i in range(len(united)):
+    if united[i]:
+      fu.append(us[i])
+      fv.append(vs[i])
+  return fu, fv
+
+def connected_components(n: int,
+                         edge_source: Union[Tuple[Sequence[int], Sequence[int]], List[Tuple[Sequence[int], Sequence[int]]]],
+                         workers: Optional[int]=None,
+                         threshold: int=1<<20) -> array:
+  '''
+  n頂点のグラフの連結成分の番号(UnionFind.labels()と同じ)を返す
+  edge_source: (us, vs) または (us, vs)のリスト(シャード)
+  辺の総数がthreshold未満、またはworkers <= 1なら1プロセスで計算する
+  '''
+  shards = [edge_source] if isinstance(edge_source, tuple) else list(edge_source)
+  m = sum(len(us) for us, _ in shards)
+  if workers is None:
+    workers = os.cpu_count() or 1
+  if m == 0:
+    return UnionFind(n).labels()
+  if workers <= 1 or m < threshold:
+    uf = UnionFind(n)
+    for us, vs in shards:
+      uf.unite_many(us, vs)
+    return uf.labels()
+
+  # シャード数をworkersに合わせる
+  if len(shards) < workers:
+    us = [u for s, _ in shards for u in s] if len(shards) > 1 else shards[0][0]
+    vs = [v for _, s in shards for v in s] if len(shards) > 1 else shards[0][1]
+    step = (m + workers - 1) // workers
+    shards = [(us[i:i+step], vs[i:i+step]) for i in range(0, m, step)]
+  k = len(shards)
+
+  global _shards
+  try:
+    ctx = get_context('fork')
+    _shards = shards
+    tasks = [(i, None) for i in range(k)]
+  except ValueError:
+    ctx = get_context()
+    tasks = [(i, shards[i]) for i in range(k)]
+  try:
+    with ctx.Pool(min(workers, k)) as pool:
+      forests = pool.map(_cc_worker, [(i, n, s) for i, s in tasks])
+  finally:
+    _shards = None
+
+  # 各シャードの全域森の辺だけをまとめる. 辺の総数はm以下
+  uf = UnionFind(n)
+  for fu, fv in forests:
+    uf.unite_many(fu, fv)
+  return uf.labels()
+
@@ -0,0 +1,83 @@
+from typing import List
+from array import array
+from bisect import bisect_right
+
+class PartiallyPersistentUnionFind():
+
+  # 部分永続UnionFind
+  # 時刻tはunite をt回呼んだ後の状態. 最新の状態に対してのみuniteできる
+  # ランク(サイズ)で併合し経路圧縮はしないので、木の高さはO(logN)
+
+  _INF = (1 << 31) - 1
+
+  def __init__(self, n: int) -> None:
+    '''Build a new PartiallyPersistentUnionFind. / O(N)'''
+    self._n = n
+    self._now = 0
+    self._parents = array('i', range(n))
+    self._time = array('i', [self._INF]) * n
+    self._size = array('i', [1]) * n
+    # 根ごとの(時刻, サイズ)の履歴
+    self._size_time = [[0] for _ in range(n)]
+    self._size_hist = [[1] for _ in range(n)]
+
+  def root(self, x: int, t: int=-1) -> int:
+    '''Return root of x at time t. / O(logN)'''
+    if t == -1:
+      t = self._now
+    par, time = self._parents, self._time
+    while time[x] <= t:
+      x = par[x]
+    return x
+
+  def unite(self, x: int, y: int) -> bool:
+    '''Untie x and y at time now+1. / O(logN)'''
+    self._now += 1
+    x = self.root(x)
+    y = self.root(y)
+    if x == y: return False
+    if self._size[x] < self._size[y]:
+      x, y = y, x
+    self._size[x] += self._size[y]
+    self._parents[y] = x
+    self._time[y] = self._now
+    self._size_time[x].append(self._now)
+    self._size_hist[x].append(self._size[x])
+    return True
+
+  def same(self, x: int, y: int, t: int=-1) -> bool:
+    '''Return True if x and y are connected at time t. / O(logN)'''
+    return self.root(x, t) == self.root(y, t)
+
+  def size(self, x: int, t: int=-1) -> int:
+    '''Return xが属する集合の時刻tでの要素数. / O(logN)'''
+    if t == -1:
+      t = self._now
+    x = self.root(x, t)
+    return self._size_hist[x][bisect_right(self._size_time[x], t)-1]
+
+  def connected_time(self, x: int, y: int) -> int:
+    '''xとyが初めて連結になった時刻を返す. 連結でなければ-1. / O(logN)'''
+    par, time = self._parents, self._time
+    res = 0
+    while x != y:
+      if time[x] < time[y]:
+        res = time[x]
+        x = par[x]
+      else:
+        if time[y] == self._INF:
+          return -1
+        res = time[y]
+        y = par[y]
+    return res
+
+  def now(self) -> int:
+    '''Return 現在の時刻(uniteを呼んだ回数). / O(1)'''
+    return self._now
+
+  def __str__(self) -> str:
+    groups = {}
+    for i in range(self._n):
+      groups.setdefault(self.root(i), []).append(i)
+    return '<PartiallyPersistentUnionFind> [\n' + '\n'.join(f'  {k}: {v}' for k, v in groups.items()) + '\n]'
+
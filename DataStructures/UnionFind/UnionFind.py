@@ -1,5 +1,6 @@
-from typing import List
+from typing import List, Tuple
 from collections import defaultdict
+from array import array
 
 class UnionFind():
 
@@ -7,7 +8,7 @@ class UnionFind():
     '''Build a new UnionFind. / O(N)'''
     self._n = n
     self._group_numbers = n
-    self._parents = [-1] * n
+    self._parents = array('i', [-1]) * n
 
   def root(self, x: int) -> int:
     '''Return root of x, compressing path. / O(α(N))'''
@@ -52,6 +53,63 @@ class UnionFind():
     self._parents[y] = x
     return x
 
+  def unite_many(self, us: List[int], vs: List[int]) -> bytearray:
+    '''Unite us[i] and vs[i] for each i. res[i] = 1 if united. / O(Kα(N))'''
+    par = self._parents
+    res = bytearray(len(us))
+    cnt = 0
+    for i in range(len(us)):
+      x = us[i]
+      while par[x] >= 0:
+        p = par[x]
+        if par[p] < 0:
+          x = p
+          break
+        par[x] = par[p]
+        x = par[p]
+      y = vs[i]
+      while par[y] >= 0:
+        p = par[y]
+        if par[p] < 0:
+          y = p
+          break
+        par[y] = par[p]
+        y = par[p]
+      if x == y: continue
+      if par[x] > par[y]:
+        x, y = y, x
+      par[x] += par[y]
+      par[y] = x
+      res[i] = 1
+      cnt += 1
+    self._group_numbers -= cnt
+    return res
+
+  def same_many(self, us: List[int], vs: List[int]) -> bytearray:
+    '''res[i] = 1 if same(us[i], vs[i]) else 0. / O(Kα(N))'''
+    par = self._parents
+    res = bytearray(len(us))
+    for i in range(len(us)):
+      x = us[i]
+      while par[x] >= 0:
+        p = par[x]
+        if par[p] < 0:
+          x = p
+          break
+        par[x] = par[p]
+        x = par[p]
+      y = vs[i]
+      while par[y] >= 0:
+        p = par[y]
+        if par[p] < 0:
+          y = p
+          break
+        par[y] = par[p]
+        y = par[p]
+      if x == y:
+        res[i] = 1
+    return res
+
   def size(self, x: int) -> int:
     '''Return xが属する集合の要素数. / O(α(N))'''
     return -self._parents[self.root(x)]
@@ -80,6 +138,34 @@ class UnionFind():
       group_members[self.root(member)].append(member)
     return group_members
 
+  def labels(self) -> array:
+    '''Return label[i] = 0, 1, ..., group_count()-1 in order of first appearance. / O(Nα(N))'''
+    label = array('i', [-1]) * self._n
+    k = 0
+    root = self.root
+    for i in range(self._n):
+      r = root(i)
+      if label[r] == -1:
+        label[r] = k
+        k += 1
+      label[i] = label[r]
+    return label
+
+  def groups(self) -> Tuple[array, array]:
+    '''Return (start, members). members[start[k]:start[k+1]] is k-th group (k = labels()). / O(Nα(N))'''
+    label = self.labels()
+    start = array('i', bytes(4*(self._group_numbers+1)))
+    for l in label:
+      start[l+1] += 1
+    for k in range(self._group_numbers):
+      start[k+1] += start[k]
+    pos = start[:-1]
+    members = array('i', bytes(4*self._n))
+    for i, l in enumerate(label):
+      members[pos[l]] = i
+      pos[l] += 1
+    return start, members
+
   def clear(self) -> None:
     '''Clear. / O(N)'''
     self._group_numbers = self._n
@@ -241,3 +241,137 @@ def factorization(n: int) -> list:
   if n != 1:
     res.append(n)
   return res
+
+#  -----------------------  #
+
+# senkeifurui
+"線形篩でN以下の φ, μ, σ0, σ1, 素因数の種類数 を一括で求める"
+"O(N)"
+from typing import List, Callable
+
+class MultiplicativeTable:
+
+  def __init__(self, n: int):
+    n = max(n, 1)
+    lpf = [0] * (n+1)
+    phi = [0] * (n+1)
+    mu = [0] * (n+1)
+    sigma0 = [0] * (n+1)
+    sigma1 = [0] * (n+1)
+    omega = [0] * (n+1)
+    # pk[i]: iを割り切る最小素因数の最大べき, cnt[i]: その指数
+    pk = [0] * (n+1)
+    cnt = [0] * (n+1)
+    phi[1] = mu[1] = sigma0[1] = sigma1[1] = pk[1] = 1
+    primes = []
+    for i in range(2, n+1):
+      if lpf[i] == 0:
+        lpf[i] = i
+        primes.append(i)
+        phi[i] = i - 1
+        mu[i] = -1
+        sigma0[i] = 2
+        sigma1[i] = i + 1
+        omega[i] = 1
+        pk[i] = i
+        cnt[i] = 1
+      lp = lpf[i]
+      for p in primes:
+        j = i * p
+        if p > lp or j > n: break
+        lpf[j] = p
+        if p == lp:
+          phi[j] = phi[i] * p
+          omega[j] = omega[i]
+          c = cnt[i] + 1
+          q = pk[i] * p
+          cnt[j] = c
+          pk[j] = q
+          rest = i // pk[i]
+          sigma0[j] = sigma0[rest] * (c+1)
+          sigma1[j] = sigma1[rest] * ((q*p-1)//(p-1))
+          break
+        phi[j] = phi[i] * (p-1)
+        mu[j] = -mu[i]
+        omega[j] = omega[i] + 1
+        cnt[j] = 1
+        pk[j] = p
+        sigma0[j] = sigma0[i] * 2
+        sigma1[j] = sigma1[i] * (p+1)
+    self.n = n
+    self.primes = primes
+    self.lpf = lpf
+    self.phi = phi
+    self.mu = mu
+    self.sigma0 = sigma0
+    self.sigma1 = sigma1
+    self.omega = omega
+    self._phi_acc = None
+    self._mu_acc = None
+    self._phi_memo = {}
+    self._mu_memo = {}
+
+  def _build_acc(self) -> None:
+    n = self.n
+    phi, mu = self.phi, self.mu
+    phi_acc = [0] * (n+1)
+    mu_acc = [0] * (n+1)
+    for i in range(1, n+1):
+      phi_acc[i] = phi_acc[i-1] + phi[i]
+      mu_acc[i] = mu_acc[i-1] + mu[i]
+    self._phi_acc = phi_acc
+    self._mu_acc = mu_acc
+
+  def _du_sieve(self, x: int, acc: List[int], memo: dict, sum_h: Callable[[int], int]) -> int:
+    # f * 1 = h なる f について Σ_{i<=x} f(i) を求める (杜教筛)
+    # n//d の値ごとに小さい順に計算するので再帰しない
+    if x <= self.n:
+      return acc[x]
+    if x in memo:
+      return memo[x]
+    vals = []
+    d = 1
+    while d <= x:
+      v = x // d
+      if v > self.n and v not in memo:
+        vals.append(v)
+      d = x // v + 1
+    for v in reversed(vals):
+      res = sum_h(v)
+      d = 2
+      while d <= v:
+        w = v // d
+        nd = v // w + 1
+        res -= (nd-d) * (acc[w] if w <= self.n else memo[w])
+        d = nd
+      memo[v] = res
+    return memo[x]
+
+  def phi_sum(self, x: int) -> int:
+    '''Σ_{i<=x} φ(i) を返す. テーブルサイズをx^(2/3)程度にするとO(x^(2/3))'''
+    if self._phi_acc is None: self._build_acc()
+    return self._du_sieve(x, self._phi_acc, self._phi_memo, lambda v: v*(v+1)//2)
+
+  def mertens(self, x: int) -> int:
+    '''Σ_{i<=x} μ(i) を返す. テーブルサイズをx^(2/3)程度にするとO(x^(2/3))'''
+    if self._mu_acc is None: self._build_acc()
+    return self._du_sieve(x, self._mu_acc, self._mu_memo, lambda v: 1)
+
+def dirichlet_convolution(f: List[int], g: List[int], n: int, mod: int=0) -> List[int]:
+  '''h(k) = Σ_{ij=k} f(i)g(j) をk<=nについて返す. f[0], g[0]は無視する. O(NlogN)'''
+  h = [0] * (n+1)
+  for i in range(1, n+1):
+    fi = f[i]
+    if fi == 0: continue
+    for j in range(1, n//i+1):
+      h[i*j] += fi * g[j]
+  if mod:
+    h = [x % mod for x in h]
+  return h
+
+def phi_sum(x: int) -> int:
+  return MultiplicativeTable(int(x**(2/3))+1).phi_sum(x)
+
+def mertens(x: int) -> int:
+  return MultiplicativeTable(int(x**(2/3))+1).mertens(x)
+
@@ -252,3 +252,119 @@ class Fraction():
     # return f'Fraction({self.n}, {self.d})'
     return str(self)
 
+
+# ---------------------- #
+
+from typing import List, Union, Optional
+from math import gcd
+
+class RationalMatrix():
+  # 有理数行列
+  # 各行を分母のlcm倍して整数行列にし、Bareissの割り算なし消去法で計算する
+  # 途中はすべて整数(小行列式)で、Fractionは最後に作る
+
+  def __init__(self, a: List[List[Union[int, Fraction]]]):
+    self.n: int = len(a)
+    self.m: int = len(a[0]) if self.n > 0 else 0
+    rows = []
+    scale = []
+    for ai in a:
+      l = 1
+      for x in ai:
+        if isinstance(x, Fraction):
+          l = l // gcd(l, x.d) * x.d
+      rows.append([x.n * (l // x.d) if isinstance(x, Fraction) else x * l for x in ai])
+      scale.append(l)
+    # self.a[i] = (元の行列のi行目) * self.scale[i]
+    self.a: List[List[int]] = rows
+    self.scale: List[int] = scale
+
+  @staticmethod
+  def _eliminate(a: List[List[int]], m: int, jordan: bool):
+    # 先頭m列についてBareiss法で消去する(a は破壊的に変更)
+    # jordan=Trueなら上の行も消去し、ピボットはすべて最後のprevに揃う
+    n = len(a)
+    prev = 1
+    sign = 1
+    pivots = []
+    r = 0
+    for c in range(m):
+      if r == n: break
+      for p in range(r, n):
+        if a[p][c] != 0: break
+      else:
+        continue
+      if p != r:
+        a[r], a[p] = a[p], a[r]
+        sign = -sign
+      ar = a[r]
+      piv = ar[c]
+      w = len(ar)
+      for i in range(0 if jordan else r+1, n):
+        if i == r: continue
+        ai = a[i]
+        f = ai[c]
+        if f == 0 and not jordan:
+          # 下の行は f == 0 でも prev で割り直す必要がある
+          for j in range(c+1, w):
+            ai[j] = piv * ai[j] // prev
+          continue
+        st = 0 if jordan else c
+        for j in range(st, w):
+          ai[j] = (piv * ai[j] - f * ar[j]) // prev
+      prev = piv
+      pivots.append(c)
+      r += 1
+    return pivots, prev, sign
+
+  def det(self) -> Fraction:
+    assert self.n == self.m
+    a = [ai[:] for ai in self.a]
+    pivots, prev, sign = RationalMatrix._eliminate(a, self.m, False)
+    if len(pivots) < self.n:
+      return Fraction(0)
+    d = 1
+    for s in self.scale:
+      d *= s
+    return Fraction(sign * prev, d)
+
+  def rank(self) -> int:
+    a = [ai[:] for ai in self.a]
+    return len(RationalMatrix._eliminate(a, self.m, False)[0])
+
+  def solve(self, b: List[Union[int, Fraction]]) -> Optional[List[Fraction]]:
+    # Ax = b の解を1つ返す(自由変数は0). 解なしならNone
+    assert len(b) == self.n
+    a = []
+    for ai, s, x in zip(self.a, self.scale, b):
+      if isinstance(x, Fraction):
+        l = x.d // gcd(s, x.d)
+        a.append([y * l for y in ai] + [x.n * (s * l // x.d)])
+      else:
+        a.append(ai + [x * s])
+    pivots, prev, _ = RationalMatrix._eliminate(a, self.m, True)
+    for i in range(len(pivots), self.n):
+      if a[i][self.m] != 0:
+        return None
+    res = [Fraction(0)] * self.m
+    for i, c in enumerate(pivots):
+      res[c] = Fraction(a[i][self.m], prev)
+    return res
+
+  def inv(self) -> Optional[List[List[Fraction]]]:
+    # 逆行列を返す. 正則でないならNone
+    assert self.n == self.m
+    n = self.n
+    a = []
+    for i, ai in enumerate(self.a):
+      e = [0] * n
+      e[i] = self.scale[i]
+      a.append(ai + e)
+    pivots, prev, _ = RationalMatrix._eliminate(a, n, True)
+    if len(pivots) < n:
+      return None
+    return [[Fraction(x, prev) for x in ai[n:]] for ai in a]
+
+  def __str__(self):
+    return str([[Fraction(x, s) for x in ai] for ai, s in zip(self.a, self.scale)])
+
@@ -1,138 +1,157 @@
+from typing import List
+
 class ModComb:
 
-  # nCr2のみをつかうときなどは、limit=-1とかにすると吉
+  # テーブルはnCrなどで大きいnが来たときに倍々で伸ばすので、limitは目安でよい
+  # modは素数であること. n >= modのときはLucasの定理で求める
+  # Lucasの各桁は、mod <= LUCAS_LIMITならテーブル(大きさmod)で、そうでなければ桁ごとの積で求める
+  # テーブルが自動で伸びるのは max(limit, LUCAS_LIMIT) まで. それより大きいnは、min(r, n-r)が小さければO(r)の積で求める
+  LUCAS_LIMIT = 1 << 20
+
   def __init__(self, limit: int, mod: int):
-    n = max(1, limit) + 1
-    fact = [0] * n
-    factinv = [0] * n
-    inv = [0] * n
-    fact[0] = 1
-    fact[1] = 1
-    factinv[0] = 1
-    factinv[1] = 1
-    inv[1] = 1
-    for i in range(2, limit+1):
-      fact[i] = fact[i-1] * i % mod
-      inv[i] = -inv[mod % i] * (mod // i) % mod
-      factinv[i] = factinv[i-1] * inv[i] % mod
-    self._fact = fact
-    self._factinv = factinv
-    self._inv = inv
-    self._limit = limit
     self._mod = mod
+    self._cap = max(limit, self.LUCAS_LIMIT)
+    self._fact = [1, 1]
+    self._factinv = [1, 1]
+    self._inv = [0, 1]
+    self._limit = 1
+    if limit > 1:
+      self._extend(limit)
+
+  def _extend(self, n: int) -> None:
+    mod = self._mod
+    n = min(max(n, self._limit<<1), mod-1, max(n, self._cap))
+    if n <= self._limit: return
+    fact, factinv, inv = self._fact, self._factinv, self._inv
+    m = self._limit + 1
+    f = fact[-1]
+    for i in range(m, n+1):
+      f = f * i % mod
+      fact.append(f)
+    # 逆元は1回のpowで末尾から求める
+    factinv.extend([0] * (n+1-m))
+    inv.extend([0] * (n+1-m))
+    f = pow(fact[n], mod-2, mod)
+    for i in range(n, m-1, -1):
+      factinv[i] = f
+      inv[i] = f * fact[i-1] % mod
+      f = f * i % mod
+    self._limit = n
 
   def nPr(self, n: int, r: int) -> int:
     if r < 0 or n < r: return 0
+    mod = self._mod
+    if n >= mod:
+      # n(n-1)...(n-r+1). r >= modなら0
+      if r >= mod: return 0
+      res = 1
+      for i in range(n-r+1, n+1):
+        res = res * i % mod
+      return res
+    if n > self._cap:
+      assert r <= self._cap, \
+          f'ValueError: ModComb.nPr({n}, {r}), n and r are too large for the table limit {self._cap}'
+      res = 1
+      for i in range(n-r+1, n+1):
+        res = res * i % mod
+      return res
+    if n > self._limit: self._extend(n)
     return self._fact[n] * self._factinv[n-r] % self._mod
 
   def nCr(self, n: int, r: int) -> int:
     if r < 0 or n < r: return 0
-    return (self._fact[n] * self._factinv[r] % self._mod) * self._factinv[n-r] % self._mod
+    mod = self._mod
+    if n >= mod: return self._lucas(n, r)
+    if n > self._cap:
+      assert min(r, n-r) <= self._cap, \
+          f'ValueError: ModComb.nCr({n}, {r}), min(r, n-r) is too large for the table limit {self._cap}'
+      return self.nCr2(n, r)
+    if n > self._limit: self._extend(n)
+    return (self._fact[n] * self._factinv[r] % mod) * self._factinv[n-r] % mod
 
   def nHr(self, n: int, r: int) -> int:
     return self.nCr(n+r-1, n-1)
 
-  def nCr2(self, n: int, r: int) -> int:
-    ret = 1
-    if r > n-r:
-      r = n-r
-    for i in range(r):
-      ret *= n-i
-      ret %= self._mod
-    for i in range(1, r+1):
-      ret *= pow(i, self._mod-2, self._mod)
-      ret %= self._mod
-    return ret
-
-
-class ModComb1000000007:
-
-  # nCr2のみをつかうときなどは、limit=-1とかにすると吉
-  def __init__(self, limit: int):
-    n = max(1, limit) + 1
-    fact = [0] * n
-    factinv = [0] * n
-    inv = [0] * n
-    fact[0] = 1
-    fact[1] = 1
-    factinv[0] = 1
-    factinv[1] = 1
-    inv[1] = 1
-    for i in range(2, limit+1):
-      fact[i] = fact[i-1] * i % 1000000007
-      inv[i] = -inv[1000000007 % i] * (1000000007 // i) % 1000000007
-      factinv[i] = factinv[i-1] * inv[i] % 1000000007
-    self._fact = fact
-    self._factinv = factinv
-    self._inv = inv
-    self._limit = limit
-
-  def nPr(self, n: int, r: int) -> int:
-    if r < 0 or n < r: return 0
-    return self._fact[n] * self._factinv[n-r] % 1000000007
-
-  def nCr(self, n: int, r: int) -> int:
-    if r < 0 or n < r: return 0
-    return (self._fact[n] * self._factinv[r] % 1000000007) * self._factinv[n-r] % 1000000007
-
-  def nHr(self, n: int, r: int) -> int:
-    return self.nCr(n+r-1, n-1)
+  def _lucas(self, n: int, r: int) -> int:
+    mod = self._mod
+    small = mod <= self.LUCAS_LIMIT
+    if small and self._limit < mod-1: self._extend(mod-1)
+    res = 1
+    while r:
+      ni, ri = n % mod, r % mod
+      if ni < ri: return 0
+      if small or ni <= self._limit:
+        fact, factinv = self._fact, self._factinv
+        res = res * fact[ni] % mod * factinv[ri] % mod * factinv[ni-ri] % mod
+      else:
+        assert min(ri, ni-ri) <= self.LUCAS_LIMIT, \
+            f'ValueError: ModComb.nCr, digit C({ni}, {ri}) is too large for mod={mod}'
+        res = res * self.nCr2(ni, ri) % mod
+      n //= mod
+      r //= mod
+    return res
 
   def nCr2(self, n: int, r: int) -> int:
-    ret = 1
-    if r > n-r:
-      r = n-r
-    for i in range(r):
-      ret *= n-i
-      ret %= 1000000007
-    for i in range(1, r+1):
-      ret *= pow(i, 1000000005, 1000000007)
-      ret %= 1000000007
-    return ret
-
-
-class ModComb998244353:
-
-  # nCr2のみをつかうときなどは、limit=-1とかにすると吉
-  def __init__(self, limit: int):
-    n = max(1, limit) + 1
-    fact = [0] * n
-    factinv = [0] * n
-    inv = [0] * n
-    fact[0] = 1
-    fact[1] = 1
-    factinv[0] = 1
-    factinv[1] = 1
-    inv[1] = 1
-    for i in range(2, limit+1):
-      fact[i] = fact[i-1] * i % 998244353
-      inv[i] = -inv[998244353 % i] * (998244353 // i) % 998244353
-      factinv[i] = factinv[i-1] * inv[i] % 998244353
-    self._fact = fact
-    self._factinv = factinv
-    self._inv = inv
-    self._limit = limit
-
-  def nPr(self, n: int, r: int) -> int:
+    # nが大きくrが小さいとき. O(r + log(mod))
     if r < 0 or n < r: return 0
-    return self._fact[n] * self._factinv[n-r] % 998244353
-
-  def nCr(self, n: int, r: int) -> int:
-    if r < 0 or n < r: return 0
-    return (self._fact[n] * self._factinv[r] % 998244353) * self._factinv[n-r] % 998244353
-
-  def nHr(self, n: int, r: int) -> int:
-    return self.nCr(n+r-1, n-1)
-
-  def nCr2(self, n: int, r: int) -> int:
-    ret = 1
     if r > n-r:
       r = n-r
-    for i in range(r):
-      ret *= n-i
-      ret %= 998244353
-    for i in range(1, r+1):
-      ret *= pow(i, 998244351, 998244353)
-      ret %= 998244353
-    return ret
+    mod = self._mod
+    num = 1
+    for i in range(n-r+1, n+1):
+      num = num * i % mod
+    if r <= self._limit:
+      return num * self._factinv[r] % mod
+    den = 1
+    for i in range(2, r+1):
+      den = den * i % mod
+    return num * pow(den, mod-2, mod) % mod
+
+  def nCr_many(self, ns: List[int], rs: List[int]) -> List[int]:
+    mod = self._mod
+    m = max((n for n, r in zip(ns, rs) if 0 <= r <= n < mod and n <= self._cap), default=0)
+    if m > self._limit: self._extend(m)
+    fact, factinv, nCr, limit = self._fact, self._factinv, self.nCr, self._limit
+    res = [0] * len(ns)
+    for i, (n, r) in enumerate(zip(ns, rs)):
+      if r < 0 or n < r: continue
+      if n > limit:
+        res[i] = nCr(n, r)
+      else:
+        res[i] = fact[n] * factinv[r] % mod * factinv[n-r] % mod
+    return res
+
+  def fact(self, n: int) -> int:
+    if n >= self._mod: return 0
+    assert n <= self._cap, \
+        f'ValueError: ModComb.fact({n}), n is too large for the table limit {self._cap}'
+    if n > self._limit: self._extend(n)
+    return self._fact[n]
+
+  def factinv(self, n: int) -> int:
+    '''n >= modのときn! = 0なので, 0を返す'''
+    if n >= self._mod: return 0
+    assert n <= self._cap, \
+        f'ValueError: ModComb.factinv({n}), n is too large for the table limit {self._cap}'
+    if n > self._limit: self._extend(n)
+    return self._factinv[n]
+
+  def inv(self, n: int) -> int:
+    '''nがmodの倍数なら0を返す'''
+    n %= self._mod
+    if n > self._cap: return pow(n, self._mod-2, self._mod)
+    if n > self._limit: self._extend(n)
+    return self._inv[n]
+
+
+class ModComb1000000007(ModComb):
+
+  def __init__(self, limit: int=0):
+    super().__init__(limit, 1000000007)
+
+
+class ModComb998244353(ModComb):
+
+  def __init__(self, limit: int=0):
+    super().__init__(limit, 998244353)
 
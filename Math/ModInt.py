@@ -300,3 +300,146 @@ class ModInt:
 mint = ModInt
 
 # ---------------------- #
+
+from typing import Union
+from functools import lru_cache
+
+def ModIntFactory(mod: int) -> type:
+  # 任意のmodのModIntクラスを生成する
+  # += や *= などは新しいオブジェクトを返す(dp = [mint(0)]*n; dp[0] += 1 でも他は変わらない)
+  # 速さが欲しいときは、selfを書き換えてselfを返す iadd, isub, imul, idiv, ipow を使う
+  # 値が書き換わりうるので、__hash__は定義しない(setやdictのキーにはintを使う)
+
+  @lru_cache(maxsize=1<<16)
+  def _inv(a: int) -> int:
+    return pow(a, -1, mod)
+
+  class ModInt:
+
+    __slots__ = ['val']
+
+    @classmethod
+    def get_mod(cls) -> int:
+      return mod
+
+    def __init__(self, val: int) -> None:
+      self.val = val if 0 <= val and val < mod else val % mod
+
+    def __add__(self, other: Union[int, 'ModInt']) -> 'ModInt':
+      return ModInt(self.val + (other if isinstance(other, int) else other.val))
+
+    def __sub__(self, other: Union[int, 'ModInt']) -> 'ModInt':
+      return ModInt(self.val - (other if isinstance(other, int) else other.val))
+
+    def __mul__(self, other: Union[int, 'ModInt']) -> 'ModInt':
+      return ModInt(self.val * (other if isinstance(other, int) else other.val))
+
+    def __pow__(self, other: Union[int, 'ModInt']) -> 'ModInt':
+      return ModInt(pow(self.val, (other if isinstance(other, int) else other.val), mod))
+
+    def __truediv__(self, other: Union[int, 'ModInt']) -> 'ModInt':
+      return ModInt(self.val * _inv(other % mod if isinstance(other, int) else other.val))
+
+    def iadd(self, other: Union[int, 'ModInt']) -> 'ModInt':
+      self.val = (self.val + (other if isinstance(other, int) else other.val)) % mod
+      return self
+
+    def isub(self, other: Union[int, 'ModInt']) -> 'ModInt':
+      self.val = (self.val - (other if isinstance(other, int) else other.val)) % mod
+      return self
+
+    def imul(self, other: Union[int, 'ModInt']) -> 'ModInt':
+      self.val = self.val * (other if isinstance(other, int) else other.val) % mod
+      return self
+
+    def ipow(self, other: Union[int, 'ModInt']) -> 'ModInt':
+      self.val = pow(self.val, (other if isinstance(other, int) else other.val), mod)
+      return self
+
+    def idiv(self, other: Union[int, 'ModInt']) -> 'ModInt':
+      self.val = self.val * _inv(other % mod if isinstance(other, int) else other.val) % mod
+      return self
+
+    def __radd__(self, other: int) -> 'ModInt':
+      return ModInt(other + self.val)
+
+    def __rsub__(self, other: int) -> 'ModInt':
+      return ModInt(other - self.val)
+
+    def __rmul__(self, other: int) -> 'ModInt':
+      return ModInt(other * self.val)
+
+    def __rpow__(self, other: int) -> 'ModInt':
+      return ModInt(pow(other, self.val, mod))
+
+    def __rtruediv__(self, other: int) -> 'ModInt':
+      return ModInt(other * _inv(self.val))
+
+    def __eq__(self, other: Union[int, 'ModInt']):
+      return self.val == int(other)
+
+    def __lt__(self, other: Union[int, 'ModInt']):
+      return self.val < int(other)
+
+    def __le__(self, other: Union[int, 'ModInt']):
+      return self.val <= int(other)
+
+    def __gt__(self, other: Union[int, 'ModInt']):
+      return self.val > int(other)
+
+    def __ge__(self, other: Union[int, 'ModInt']):
+      return self.val >= int(other)
+
+    def __ne__(self, other: Union[int, 'ModInt']):
+      return self.val != int(other)
+
+    def __neg__(self):
+      return ModInt(-self.val)
+
+    def __pos__(self):
+      return ModInt(self.val)
+
+    def __int__(self):
+      return self.val
+
+    def __str__(self):
+      return str(self.val)
+
+    def __repr__(self):
+      return f'{self}'
+
+  ModInt.__name__ = ModInt.__qualname__ = f'ModInt{mod}'
+  return ModInt
+
+mint = ModIntFactory(998244353)
+
+if __name__ == '__main__':
+  # 生のint + % MOD との比較
+  from time import time
+  MOD = 998244353
+  N = 10**6
+  mint = ModIntFactory(MOD)
+
+  start = time()
+  x = 1
+  for i in range(N):
+    x = (x * 3 + i) % MOD
+  t_int = time() - start
+
+  start = time()
+  x = mint(1)
+  for i in range(N):
+    x = x * 3 + i
+  t_mint = time() - start
+
+  start = time()
+  x = mint(1)
+  for i in range(N):
+    x.imul(3).iadd(i)
+  t_inplace = time() - start
+
+  print(f'int     : {t_int:.3f}s')
+  print(f'mint    : {t_mint:.3f}s ({t_mint/t_int:.1f}x)')
+  print(f'mint(in): {t_inplace:.3f}s ({t_inplace/t_int:.1f}x)')
+
+# ---------------------- #
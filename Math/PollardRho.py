@@ -55,3 +55,142 @@ class PollardRho():
             return f
     return n
 
+
+# ---------------------- #
+
+from functools import lru_cache
+from typing import List, Tuple, Iterable
+from array import array
+from random import randrange
+import math
+
+class Factorizer():
+  # 大量の数をまとめて素因数分解する
+  # 小さい数はSPFテーブル、大きい数は小さい素数で試し割りしてからBrent版PollardRho
+  # 同じ値はキャッシュ(最大cache_size個)から返す
+
+  L = [2, 325, 9375, 28178, 450775, 9780504, 1795265022]
+
+  def __init__(self, spf_limit: int=1<<20, wheel_limit: int=1000, cache_size: int=1<<16):
+    spf_limit = max(spf_limit, wheel_limit, 2)
+    spf = array('i', bytes(4*(spf_limit+1)))
+    primes = []
+    for i in range(2, spf_limit+1):
+      if spf[i] == 0:
+        spf[i] = i
+        primes.append(i)
+      si = spf[i]
+      for p in primes:
+        if p > si or i*p > spf_limit: break
+        spf[i*p] = p
+    self._spf = spf
+    self._spf_limit = spf_limit
+    self._wheel = [p for p in primes if p <= wheel_limit]
+    self._wheel_limit2 = wheel_limit * wheel_limit
+    self._factor = lru_cache(maxsize=cache_size)(self._factorization)
+
+  def _is_prime(self, n: int) -> bool:
+    if n <= self._spf_limit:
+      return self._spf[n] == n
+    d = n - 1
+    s = (d & -d).bit_length() - 1
+    d >>= s
+    for a in (Factorizer.L if n >= 1<<32 else (2, 7, 61)):
+      a %= n
+      if a == 0: continue
+      y = pow(a, d, n)
+      if y == 1 or y == n-1: continue
+      for _ in range(s-1):
+        y = y * y % n
+        if y == n-1: break
+      else:
+        return False
+    return True
+
+  @staticmethod
+  def _brent(n: int) -> int:
+    # gcdをm回に1回だけとるBrent版
+    gcd = math.gcd
+    m = 128
+    while True:
+      c = randrange(1, n)
+      y = randrange(n)
+      g = q = r = 1
+      while g == 1:
+        x = y
+        for _ in range(r):
+          y = (y*y+c) % n
+        k = 0
+        while k < r and g == 1:
+          ys = y
+          for _ in range(min(m, r-k)):
+            y = (y*y+c) % n
+            q = q * (x-y) % n
+          g = gcd(q, n)
+          k += m
+        r <<= 1
+      if g == n:
+        g = 1
+        while g == 1:
+          ys = (ys*ys+c) % n
+          g = gcd(x-ys, n)
+      if g != n:
+        return g
+
+  def _factorization(self, n: int) -> Tuple[Tuple[int, int], ...]:
+    spf = self._spf
+    res = {}
+    if n > self._spf_limit:
+      for p in self._wheel:
+        if n % p == 0:
+          e = 1
+          n //= p
+          while n % p == 0:
+            n //= p
+            e += 1
+          res[p] = e
+        if n <= self._spf_limit: break
+    if n > self._spf_limit and n < self._wheel_limit2:
+      res[n] = res.get(n, 0) + 1
+      n = 1
+    todo = [n] if n > self._spf_limit else []
+    while todo:
+      v = todo.pop()
+      if self._is_prime(v):
+        res[v] = res.get(v, 0) + 1
+        continue
+      f = self._brent(v)
+      for w in (f, v//f):
+        if w <= self._spf_limit:
+          while w > 1:
+            p = spf[w]
+            res[p] = res.get(p, 0) + 1
+            w //= p
+        else:
+          todo.append(w)
+    if n <= self._spf_limit:
+      while n > 1:
+        p = spf[n]
+        res[p] = res.get(p, 0) + 1
+        n //= p
+    return tuple(sorted(res.items()))
+
+  def factorization(self, n: int) -> List[Tuple[int, int]]:
+    '''nを素因数分解して(素数, 指数)のリストを昇順で返す'''
+    assert n >= 1
+    return list(self._factor(n))
+
+  def factorize_many(self, nums: Iterable[int]) -> List[List[Tuple[int, int]]]:
+    '''各numについてfactorization(num)を返す'''
+    f = self._factor
+    return [list(f(n)) for n in nums]
+
+_factorizer = None
+
+def factorize_many(nums: Iterable[int]) -> List[List[Tuple[int, int]]]:
+  # 既定のFactorizerを1つだけ作って使い回す(SPFテーブルとキャッシュを呼び出し間で共有する)
+  global _factorizer
+  if _factorizer is None:
+    _factorizer = Factorizer()
+  return _factorizer.factorize_many(nums)
+
@@ -0,0 +1,114 @@
+import random
+from typing import List, Union
+
+_MOD = (1<<61) - 1
+_MASK30 = (1<<30) - 1
+_MASK31 = (1<<31) - 1
+
+def _mul(a: int, b: int) -> int:
+  # a * b % _MOD を64bitに収まる範囲で計算する
+  au, ad = a >> 31, a & _MASK31
+  bu, bd = b >> 31, b & _MASK31
+  mid = ad * bu + au * bd
+  x = ((au * bu) << 1) + (mid >> 30) + ((mid & _MASK30) << 31) + ad * bd
+  x = (x >> 61) + (x & _MOD)
+  return x - _MOD if x >= _MOD else x
+
+class DynamicHashString():
+  # 1点更新ができるローリングハッシュ
+  # セグ木の各ノードに区間の(順方向, 逆方向)のハッシュをもつ
+
+  def __init__(self, s: Union[str, List[int]]):
+    a = [ord(c) for c in s] if isinstance(s, str) else list(s)
+    self._n = len(a)
+    self._log = (self._n - 1).bit_length()
+    self._size = 1 << self._log
+    size = self._size
+    b = random.randrange(1<<8, _MOD-1)
+    powb = [1] * (self._n+1)
+    for i in range(self._n):
+      powb[i+1] = _mul(powb[i], b)
+    fwd = [0] * (size << 1)
+    rev = [0] * (size << 1)
+    lens = [0] * (size << 1)
+    for i, c in enumerate(a):
+      fwd[size+i] = rev[size+i] = c + 1
+      lens[size+i] = 1
+    for i in range(size-1, 0, -1):
+      l, r = i << 1, i << 1 | 1
+      fwd[i] = (_mul(fwd[l], powb[lens[r]]) + fwd[r]) % _MOD
+      rev[i] = (_mul(rev[r], powb[lens[l]]) + rev[l]) % _MOD
+      lens[i] = lens[l] + lens[r]
+    self._a = a
+    self._powb = powb
+    self._fwd = fwd
+    self._rev = rev
+    self._lens = lens
+
+  def set(self, k: int, c: Union[str, int]) -> None:
+    '''s[k] <- c. / O(logN)'''
+    assert 0 <= k < self._n, \
+        f'IndexError: DynamicHashString.set({k}, {c}), n={self._n}'
+    c = ord(c) if isinstance(c, str) else c
+    self._a[k] = c
+    fwd, rev, lens, powb = self._fwd, self._rev, self._lens, self._powb
+    k += self._size
+    fwd[k] = rev[k] = c + 1
+    for _ in range(self._log):
+      k >>= 1
+      l, r = k << 1, k << 1 | 1
+      fwd[k] = (_mul(fwd[l], powb[lens[r]]) + fwd[r]) % _MOD
+      rev[k] = (_mul(rev[r], powb[lens[l]]) + rev[l]) % _MOD
+
+  def _prod(self, l: int, r: int):
+    fwd, rev, lens, powb = self._fwd, self._rev, self._lens, self._powb
+    l += self._size
+    r += self._size
+    lf = lr = ll = 0
+    rf = rr = rl = 0
+    while l < r:
+      if l & 1:
+        lf = (_mul(lf, powb[lens[l]]) + fwd[l]) % _MOD
+        lr = (_mul(rev[l], powb[ll]) + lr) % _MOD
+        ll += lens[l]
+        l += 1
+      if r & 1:
+        r ^= 1
+        rf = (_mul(fwd[r], powb[rl]) + rf) % _MOD
+        rr = (_mul(rr, powb[lens[r]]) + rev[r]) % _MOD
+        rl += lens[r]
+      l >>= 1
+      r >>= 1
+    return (_mul(lf, powb[rl]) + rf) % _MOD, (_mul(rr, powb[ll]) + lr) % _MOD
+
+  def get(self, l: int, r: int) -> int:
+    '''Return hash(s[l:r]). / O(logN)'''
+    assert 0 <= l <= r <= self._n, \
+        f'IndexError: DynamicHashString.get({l}, {r}), n={self._n}'
+    return self._prod(l, r)[0]
+
+  def get_rev(self, l: int, r: int) -> int:
+    '''Return hash(s[l:r][::-1]). / O(logN)'''
+    assert 0 <= l <= r <= self._n, \
+        f'IndexError: DynamicHashString.get_rev({l}, {r}), n={self._n}'
+    return self._prod(l, r)[1]
+
+  def is_palindrome(self, l: int, r: int) -> bool:
+    '''s[l:r]が回文かどうか. / O(logN)'''
+    assert 0 <= l <= r <= self._n, \
+        f'IndexError: DynamicHashString.is_palindrome({l}, {r}), n={self._n}'
+    hf, hr = self._prod(l, r)
+    return hf == hr
+
+  def __getitem__(self, k: int) -> int:
+    return self._a[k]
+
+  def __setitem__(self, k: int, c: Union[str, int]) -> None:
+    self.set(k, c)
+
+  def __len__(self) -> int:
+    return self._n
+
+  def __str__(self) -> str:
+    return ''.join(map(chr, self._a))
+
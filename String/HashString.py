@@ -1,25 +1,55 @@
 import random
+from typing import List, Union
 # random.seed(0)
 
-# _MOD = 2**61-1  # MODはglobalにとる
-_MOD = 998244353
+_MOD = (1<<61) - 1  # MODはglobalにとる
+_MASK30 = (1<<30) - 1
+_MASK31 = (1<<31) - 1
+
+def _mul(a: int, b: int) -> int:
+  # a * b % _MOD を64bitに収まる範囲で計算する
+  au, ad = a >> 31, a & _MASK31
+  bu, bd = b >> 31, b & _MASK31
+  mid = ad * bu + au * bd
+  x = ((au * bu) << 1) + (mid >> 30) + ((mid & _MASK30) << 31) + ad * bd
+  x = (x >> 61) + (x & _MOD)
+  return x - _MOD if x >= _MOD else x
+
 class HashString:
 
-  def __init__(self, s: str):
-    self.b = random.randint(37, 10000)
+  # 基数とその累乗はすべてのインスタンスで共有する
+  # (なので、異なるインスタンスのハッシュ同士も比較できる)
+  b = random.randrange(1<<8, _MOD-1)
+  powb = [1]
+
+  @classmethod
+  def _extend_powb(cls, n: int) -> None:
+    powb, b = cls.powb, cls.b
+    for _ in range(len(powb), n+1):
+      powb.append(_mul(powb[-1], b))
+
+  def __init__(self, s: Union[str, bytes, List[int]]):
     self.n = len(s)
-    self.data = [0] * (self.n+1)
-    self.powb = [1] * (self.n+1)
-    for i in range(1, self.n+1):
-      self.powb[i] = self.powb[i-1] * self.b % _MOD
-      self.data[i] = (self.b * self.data[i-1] + ord(s[i-1])) % _MOD
+    if len(HashString.powb) <= self.n:
+      HashString._extend_powb(self.n)
+    self.s = [ord(c) for c in s] if isinstance(s, str) else list(s)
+    b = HashString.b
+    data = [0] * (self.n+1)
+    for i, c in enumerate(self.s):
+      x = _mul(data[i], b) + c + 1
+      data[i+1] = x - _MOD if x >= _MOD else x
+    self.data = data
 
   def get(self, l: int, r: int) -> int:
-    return (self.data[r] - self.data[l] * self.powb[r-l]) % _MOD
+    return (self.data[r] - _mul(self.data[l], HashString.powb[r-l])) % _MOD
+
+  def get_many(self, ls: List[int], rs: List[int]) -> List[int]:
+    data, powb = self.data, HashString.powb
+    return [(data[r] - _mul(data[l], powb[r-l])) % _MOD for l, r in zip(ls, rs)]
 
   def __getitem__(self, item) -> int:
     if isinstance(item, int):
-      return (self.data[item+1] - self.data[item] * self.powb[1]) % _MOD
+      return self.get(item, item+1)
     else:
       start = item.start
       stop = item.stop
@@ -29,6 +59,25 @@ class HashString:
         stop = self.n
       return self.get(start, stop)
 
+  def lcp(self, i: int, j: int) -> int:
+    '''s[i:]とs[j:]の最長共通接頭辞の長さを返す. O(logN)'''
+    if i == j: return self.n - i
+    data, powb = self.data, HashString.powb
+    ok, ng = 0, self.n - max(i, j) + 1
+    while ng - ok > 1:
+      mid = (ok + ng) >> 1
+      if (data[i+mid] - _mul(data[i], powb[mid])) % _MOD == (data[j+mid] - _mul(data[j], powb[mid])) % _MOD:
+        ok = mid
+      else:
+        ng = mid
+    return ok
+
+  def compare(self, i: int, j: int, length: int) -> int:
+    '''s[i:i+length]とs[j:j+length]を辞書順比較し, -1/0/1を返す. O(logN)'''
+    k = self.lcp(i, j)
+    if k >= length: return 0
+    return -1 if self.s[i+k] < self.s[j+k] else 1
+
   def update(self, h: int, c1: str, c2: str, k: int) -> int:
     '''
     h1: int  元のハッシュ
@@ -36,15 +85,19 @@ class HashString:
     c2: char 新たな文字
     k : int  変える桁 ZeroIndexed
     '''
-    return (h + (ord(c2) - ord(c1))*self.powb[self.n-k-1]) % _MOD
+    return (h + _mul((ord(c2) - ord(c1)) % _MOD, HashString.powb[self.n-k-1])) % _MOD
 
   def unite(self, h1: int, h2: int, k: int) -> int:
-    return (h1 * self.powb[k] + h2) % _MOD
+    '''h1の後ろに長さkのh2をつなげたハッシュを返す'''
+    if len(HashString.powb) <= k:
+      HashString._extend_powb(k)
+    return (_mul(h1, HashString.powb[k]) + h2) % _MOD
 
   def popleftappend(self, h: int, c1: str, c2: str) -> int:
     '''
     hの長さはnであると仮定
     c1は元の文字, c2は新たな文字
     '''
-    return ((h - ord(c1)*self.powb[self.n-1]) * self.b + ord(c2)) % _MOD
+    h = (h - _mul(ord(c1)+1, HashString.powb[self.n-1])) % _MOD
+    return (_mul(h, HashString.b) + ord(c2) + 1) % _MOD
 
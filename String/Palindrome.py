@@ -0,0 +1,119 @@
+from typing import List, Tuple, Union
+
+def manacher(s: Union[str, List[int]]) -> Tuple[List[int], List[int]]:
+  '''
+  odd[i]: s[i]を中心とする最長の奇数長回文の半径(長さは2*odd[i]-1)
+  even[i]: s[i-1]とs[i]の間を中心とする最長の偶数長回文の半径(長さは2*even[i])
+  を返す. / O(N)
+  '''
+  n = len(s)
+  odd = [0] * n
+  l, r = 0, -1
+  for i in range(n):
+    k = 1 if i > r else min(odd[l+r-i], r-i+1)
+    while i-k >= 0 and i+k < n and s[i-k] == s[i+k]:
+      k += 1
+    odd[i] = k
+    if i+k-1 > r:
+      l, r = i-k+1, i+k-1
+  even = [0] * n
+  l, r = 0, -1
+  for i in range(n):
+    k = 0 if i > r else min(even[l+r-i+1], r-i+1)
+    while i-k-1 >= 0 and i+k < n and s[i-k-1] == s[i+k]:
+      k += 1
+    even[i] = k
+    if i+k-1 > r:
+      l, r = i-k, i+k-1
+  return odd, even
+
+
+class Palindrome():
+  # manacherの前計算でs[l:r]が回文かどうかをO(1)で判定する
+
+  def __init__(self, s: Union[str, List[int]]):
+    self.n = len(s)
+    self.odd, self.even = manacher(s)
+
+  def is_palindrome(self, l: int, r: int) -> bool:
+    '''s[l:r]が回文かどうか. / O(1)'''
+    assert 0 <= l <= r <= self.n, \
+        f'IndexError: Palindrome.is_palindrome({l}, {r}), n={self.n}'
+    k = r - l
+    if k <= 1: return True
+    m = (l + r) >> 1
+    if k & 1:
+      return self.odd[m] >= (k+1) >> 1
+    return self.even[m] >= k >> 1
+
+  def longest(self) -> Tuple[int, int]:
+    '''最長の回文部分文字列s[l:r]の(l, r)を返す'''
+    best = (0, 0)
+    for i, k in enumerate(self.odd):
+      if 2*k-1 > best[1]-best[0]:
+        best = (i-k+1, i+k)
+    for i, k in enumerate(self.even):
+      if 2*k > best[1]-best[0]:
+        best = (i-k, i+k)
+    return best
+
+
+class PalindromicTree():
+  # 回文木(eertree)
+  # 頂点0: 長さ-1の根, 頂点1: 長さ0の根
+  # 末尾に1文字ずつ追加できる
+
+  def __init__(self, s: Union[str, List[int]]=()):
+    self._s = []
+    self._len = [-1, 0]
+    self._link = [0, 0]
+    self._next = [{}, {}]
+    self._cnt = [0, 0]
+    self._last = 1
+    for c in s:
+      self.append(c)
+
+  def _get_link(self, v: int) -> int:
+    s, length = self._s, self._len
+    i = len(s) - 1
+    while True:
+      j = i - length[v] - 1
+      if j >= 0 and s[j] == s[i]:
+        return v
+      v = self._link[v]
+
+  def append(self, c) -> int:
+    '''末尾にcを追加し、追加後の最長回文接尾辞の長さを返す. / 償却O(1)'''
+    self._s.append(c)
+    v = self._get_link(self._last)
+    nxt = self._next[v]
+    if c not in nxt:
+      u = len(self._len)
+      self._len.append(self._len[v] + 2)
+      self._next.append({})
+      self._cnt.append(0)
+      self._link.append(1 if self._len[u] == 1 else self._next[self._get_link(self._link[v])][c])
+      nxt[c] = u
+    u = nxt[c]
+    self._cnt[u] += 1
+    self._last = u
+    return self._len[u]
+
+  def longest_suffix(self) -> int:
+    '''現在の文字列の最長回文接尾辞の長さを返す'''
+    return self._len[self._last]
+
+  def count_distinct(self) -> int:
+    '''相異なる回文部分文字列(空文字列を除く)の個数を返す'''
+    return len(self._len) - 2
+
+  def count_all(self) -> List[int]:
+    '''各頂点(回文)の出現回数を返す. 頂点iの回文の長さはlength(i)'''
+    cnt = self._cnt[:]
+    for v in range(len(cnt)-1, 1, -1):
+      cnt[self._link[v]] += cnt[v]
+    return cnt
+
+  def length(self, v: int) -> int:
+    return self._len[v]
+
@@ -75,3 +75,197 @@ class Parser():
   def get_char(self):
     return self.s[self.ptr]
 
+
+# ---------------------- #
+
+from typing import List, Tuple, Dict, Iterable, Optional
+from functools import lru_cache
+
+class Formula():
+  '''
+  式を一度だけ後置記法の命令列にコンパイルし、変数の値を変えて何度も評価する
+  同じ式の文字列のコンパイル結果はキャッシュする
+
+  expression: < 式 >   ::= < 項 > (+ or -) < 項 > (+ or -) ...
+  term      : < 項 >   ::= < 単項 > (* or / or %) < 単項 > ...
+  unary     : < 単項 > ::= - < 単項 > or < 冪 >
+  power     : < 冪 >   ::= < 因子 > (^ < 単項 >)  右結合
+  factor    : < 因子 > ::= '(' < 式 > ')' or < 数 > or < 変数 >
+  '''
+
+  PUSH, LOAD, ADD, SUB, MUL, DIV, MOD, NEG, POW = range(9)
+  _BINOP = {'+': ADD, '-': SUB, '*': MUL, '/': DIV, '%': MOD, '^': POW}
+
+  def __init__(self, s: str):
+    self.s = s
+    self.program = Formula.compile(s)
+
+  @staticmethod
+  def _tokenize(s: str) -> List[str]:
+    res = []
+    i, n = 0, len(s)
+    while i < n:
+      c = s[i]
+      if c.isspace():
+        i += 1
+      elif c.isdigit():
+        j = i
+        while j < n and s[j].isdigit():
+          j += 1
+        res.append(s[i:j])
+        i = j
+      elif c.isalpha() or c == '_':
+        j = i
+        while j < n and (s[j].isalnum() or s[j] == '_'):
+          j += 1
+        res.append(s[i:j])
+        i = j
+      elif c in '+-*/%^()':
+        res.append(c)
+        i += 1
+      else:
+        raise ValueError(f'Formula: unexpected character {c!r}, s={s}')
+    return res
+
+  @staticmethod
+  @lru_cache(maxsize=4096)
+  def compile(s: str) -> Tuple[Tuple[int, object], ...]:
+    '''式sを(命令, 引数)の列にする'''
+    tokens = Formula._tokenize(s)
+    n = len(tokens)
+    ptr = 0
+    prog = []
+    BINOP = Formula._BINOP
+    # 冪の指数の中にいる深さ. 指数の中の二項演算は引数をTrueにして、modで割らずに計算させる
+    exp_depth = 0
+
+    def peek() -> Optional[str]:
+      return tokens[ptr] if ptr < n else None
+
+    def consume(expected: str) -> None:
+      nonlocal ptr
+      assert peek() == expected, \
+          f'Expected: {expected} but got {peek()}, s={s}'
+      ptr += 1
+
+    def expression() -> None:
+      nonlocal ptr
+      term()
+      while peek() in ('+', '-'):
+        op = BINOP[tokens[ptr]]
+        ptr += 1
+        term()
+        prog.append((op, exp_depth > 0))
+
+    def term() -> None:
+      nonlocal ptr
+      unary()
+      while peek() in ('*', '/', '%'):
+        op = BINOP[tokens[ptr]]
+        ptr += 1
+        unary()
+        prog.append((op, exp_depth > 0))
+
+    def unary() -> None:
+      nonlocal ptr
+      if peek() == '-':
+        ptr += 1
+        unary()
+        prog.append((Formula.NEG, None))
+      elif peek() == '+':
+        ptr += 1
+        unary()
+      else:
+        power()
+
+    def power() -> None:
+      nonlocal ptr, exp_depth
+      factor()
+      if peek() == '^':
+        ptr += 1
+        exp_depth += 1
+        unary()
+        exp_depth -= 1
+        prog.append((Formula.POW, exp_depth > 0))
+
+    def factor() -> None:
+      nonlocal ptr
+      t = peek()
+      assert t is not None, f'Unexpected end of formula, s={s}'
+      if t == '(':
+        consume('(')
+        expression()
+        consume(')')
+      elif t[0].isdigit():
+        prog.append((Formula.PUSH, int(t)))
+        ptr += 1
+      elif t[0].isalpha() or t[0] == '_':
+        prog.append((Formula.LOAD, t))
+        ptr += 1
+      else:
+        raise ValueError(f'Formula: unexpected token {t!r}, s={s}')
+
+    expression()
+    assert ptr == n, f'Formula: unexpected token {peek()!r}, s={s}'
+    return tuple(prog)
+
+  @staticmethod
+  def run(program: Tuple[Tuple[int, object], ...], env: Dict[str, int]={}, mod: int=0) -> int:
+    '''
+    命令列をスタックマシンで評価する. modが0でなければmodで計算し、/ はmodでの逆元をかける
+    ただし冪の指数になる部分はmodで割らずに整数で計算する. 整数で計算する冪の指数は0以上であること
+    '''
+    PUSH, LOAD, ADD, SUB, MUL, DIV, MOD, NEG, POW = range(9)
+    stack = []
+    push, pop = stack.append, stack.pop
+    for op, arg in program:
+      if op == PUSH:
+        push(arg)
+      elif op == LOAD:
+        push(env[arg])
+      elif op == NEG:
+        stack[-1] = -stack[-1]
+      else:
+        b = pop()
+        a = stack[-1]
+        # argがTrueなら指数の中なので、modを使わない
+        m = 0 if arg else mod
+        if op == ADD:
+          a += b
+        elif op == SUB:
+          a -= b
+        elif op == MUL:
+          a *= b
+        elif op == DIV:
+          a = a * pow(b, -1, m) if m else a // b  # 切り捨て
+        elif op == MOD:
+          a %= b
+        elif m:
+          a = pow(a, b, m)
+        else:
+          # 整数の範囲では負の指数を計算できない(float になる)
+          assert b >= 0, f'ValueError: Formula.run, {a}^{b}, negative exponent needs mod'
+          a **= b
+        stack[-1] = a % m if m else a
+    return stack[-1] % mod if mod else stack[-1]
+
+  def eval(self, env: Dict[str, int]={}, mod: int=0) -> int:
+    return Formula.run(self.program, env, mod)
+
+  def eval_many(self, envs: Iterable[Dict[str, int]], mod: int=0) -> List[int]:
+    run, program = Formula.run, self.program
+    return [run(program, env, mod) for env in envs]
+
+if __name__ == '__main__':
+  # 指数を計算で求める場合も pow(a, b, mod) と一致すること
+  from random import randint
+  MOD = 998244353
+  assert Formula('2^(3+7)').eval(mod=7) == pow(2, 10, 7)
+  assert Formula('2^(0-1)').eval(mod=7) == pow(2, -1, 7)
+  for _ in range(1000):
+    env = {'a': randint(1, 10**12), 'b': randint(0, 60), 'c': randint(0, 60), 'x': randint(1, 9)}
+    a, b, c, x = env['a'], env['b'], env['c'], env['x']
+    assert Formula('a^(b+c*x)').eval(env, MOD) == pow(a, b+c*x, MOD)
+    assert Formula('a^(b*(c+x)) + a*b').eval(env, MOD) == (pow(a, b*(c+x), MOD) + a*b) % MOD
+    assert Formula('2^3^x').eval(env, MOD) == pow(2, 3**x, MOD)
+  print('ok')
@@ -1,75 +1,240 @@
+from typing import List, Union, Dict, Iterable
+from array import array
+from bisect import bisect_left, bisect_right
+
 class StringCount:
 
+  # 文字列を「同じ文字が続く区間(ラン)」の列で持ち、
+  # 文字ごとのFenwickTreeの、ランの先頭位置にそのランの長さを載せる
+  # Fenwickは1本のarray('i')に文字ごとに連続して並べる
+  # 隣り合うランは必ず違う文字にしておく(同じ文字になったらまとめる)
+  # Fenwickの更新は、区間代入・区間ソートで償却O(σlogN)、1点更新でO(logN)
+  # ただしランの先頭位置はlistで持つので、ランの挿入・削除にランの個数Rに比例する時間(memmove)がかかる
+
   alp = 'abcdefghijklmnopqrstuvwxyz'
   # alp = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
-  DIC = {c: i for i, c in enumerate(alp)}
 
-  def __init__(self, s: str):
-    assert isinstance(s, str)
+  def __init__(self, s: str, alphabet: Union[str, Dict[str, int]]=alp):
+    if isinstance(alphabet, str):
+      alphabet = {c: i for i, c in enumerate(alphabet)}
+    sigma = max(alphabet.values()) + 1
+    alp = [''] * sigma
+    for c, i in alphabet.items():
+      alp[i] = c
+    self.alp = alp
+    self.DIC = alphabet
+    self.sigma = sigma
     self.n = len(s)
-    self.s = list(s)
-    self.data = [FenwickTree(self.n) for _ in range(26)]
-    for i, c in enumerate(s):
-      self.data[StringCount.DIC[c]].add(i, 1)
+    n = self.n
+    self._data = array('i', bytes(4*sigma*(n+1)))
+    self._run_char = array('i', bytes(4*(n+1)))
+    self._starts = []
+    DIC = alphabet
+    i = 0
+    while i < n:
+      j = i
+      while j < n and s[j] == s[i]:
+        j += 1
+      c = DIC[s[i]]
+      self._starts.append(i)
+      self._run_char[i] = c
+      self._data[c*(n+1)+i+1] += j - i
+      i = j
+    # O(σN)でFenwickを構築
+    data = self._data
+    for c in range(sigma):
+      base = c * (n+1)
+      for i in range(1, n+1):
+        j = i + (i & -i)
+        if j <= n:
+          data[base+j] += data[base+i]
+
+  def _add(self, c: int, k: int, v: int) -> None:
+    data, n = self._data, self.n
+    base = c * (n+1)
+    k += 1
+    while k <= n:
+      data[base+k] += v
+      k += k & -k
+
+  def _pref(self, c: int, r: int) -> int:
+    data = self._data
+    base = c * (self.n+1)
+    res = 0
+    while r > 0:
+      res += data[base+r]
+      r -= r & -r
+    return res
+
+  def _run_at(self, x: int):
+    # xを含むランの(添字, 先頭, 末尾+1, 文字)
+    starts = self._starts
+    i = bisect_right(starts, x) - 1
+    p = starts[i]
+    e = starts[i+1] if i+1 < len(starts) else self.n
+    return i, p, e, self._run_char[p]
+
+  def _count_pref(self, c: int, x: int) -> int:
+    # s[:x]のcの個数
+    if x == 0: return 0
+    _, _, e, d = self._run_at(x-1)
+    return self._pref(c, x) - (e - x if c == d else 0)
+
+  def _split(self, x: int) -> None:
+    # xがランの先頭になるようにする
+    if x <= 0 or x >= self.n: return
+    i, p, e, c = self._run_at(x)
+    if p == x: return
+    self._add(c, p, -(e-x))
+    self._add(c, x, e-x)
+    self._starts.insert(i+1, x)
+    self._run_char[x] = c
+
+  def _replace(self, l: int, r: int, runs: Iterable) -> None:
+    # [l, r)をruns: (文字, 長さ)の列で置き換える
+    self._split(l)
+    self._split(r)
+    starts, run_char, n = self._starts, self._run_char, self.n
+    i = bisect_left(starts, l)
+    j = bisect_left(starts, r)
+    for k in range(i, j):
+      p = starts[k]
+      e = starts[k+1] if k+1 < len(starts) else n
+      self._add(run_char[p], p, -(e-p))
+    new = []
+    p = l
+    for c, k in runs:
+      if k == 0: continue
+      if new and run_char[new[-1]] == c:
+        self._add(c, new[-1], k)
+      else:
+        new.append(p)
+        run_char[p] = c
+        self._add(c, p, k)
+      p += k
+    starts[i:j] = new
+    self._merge(i+len(new))
+    self._merge(i)
+
+  def _merge(self, i: int) -> None:
+    # ランi-1とランiが同じ文字なら1つにまとめる
+    starts, run_char = self._starts, self._run_char
+    if i <= 0 or i >= len(starts): return
+    p, x = starts[i-1], starts[i]
+    c = run_char[x]
+    if run_char[p] != c: return
+    e = starts[i+1] if i+1 < len(starts) else self.n
+    self._add(c, x, -(e-x))
+    self._add(c, p, e-x)
+    del starts[i]
+
+  def _substr(self, l: int, r: int) -> str:
+    # s[l:r]をランから作る
+    if l >= r: return ''
+    starts, run_char, alp = self._starts, self._run_char, self.alp
+    i = bisect_right(starts, l) - 1
+    res = []
+    p = l
+    while p < r:
+      e = starts[i+1] if i+1 < len(starts) else self.n
+      res.append(alp[run_char[starts[i]]] * (min(e, r) - p))
+      p = e
+      i += 1
+    return ''.join(res)
 
   # 区間[l, r)が昇順かどうか判定する
   def is_ascending(self, l: int, r: int) -> bool:
     # assert 0 <= l <= r <= self.n
     end = l
-    for i in range(26):
-      c = self.data[i].sum(l, r)
+    for i, c in enumerate(self.get_all_count(l, r)):
+      if c == 0: continue
       end += c
-      if end > r or self.data[i].sum(l, end) != c:
+      if self._count_pref(i, end) - self._count_pref(i, l) != c:
         return False
     return True
 
   # 区間[l, r)が降順かどうか判定する
-  # 未確認
   def is_descending(self, l: int, r: int) -> bool:
     # assert 0 <= l <= r <= self.n
-    start = r - 1
-    for i in range(25, -1, -1):
-      c = self.data[i].sum(l, r)
-      start -= c
-      if start < l or self.data[i].sum(start, r) != c:
+    end = l
+    cnt = self.get_all_count(l, r)
+    for i in range(self.sigma-1, -1, -1):
+      c = cnt[i]
+      if c == 0: continue
+      end += c
+      if self._count_pref(i, end) - self._count_pref(i, l) != c:
         return False
     return True
 
   # 区間[l, r)の最小の文字を返す
   def get_min(self, l, r):
-    for i in range(26):
-      if self.data[i].sum(l, r):
-        return StringCount.alp[i]
+    for i in range(self.sigma):
+      if self._count_pref(i, r) - self._count_pref(i, l):
+        return self.alp[i]
 
   # 区間[l, r)の最大の文字を返す
   def get_max(self, l, r):
-    for i in range(25, -1, -1):
-      if self.data[i].sum(l, r):
-        return StringCount.alp[i]
+    for i in range(self.sigma-1, -1, -1):
+      if self._count_pref(i, r) - self._count_pref(i, l):
+        return self.alp[i]
 
   # k番目の文字をcに変更する
   def __setitem__(self, k: int, c: str):
     # assert 0 <= k < self.n
-    self.data[StringCount.DIC[self.s[k]]].add(k, -1)
-    self.s[k] = c
-    self.data[StringCount.DIC[c]].add(k, 1)
+    self._replace(k, k+1, ((self.DIC[c], 1),))
+
+  # ks[i]番目の文字をcs[i]に変更する
+  def set_many(self, ks: List[int], cs: Iterable[str]):
+    DIC = self.DIC
+    for k, c in zip(ks, cs):
+      self._replace(k, k+1, ((DIC[c], 1),))
+
+  # 区間[l, r)の文字をすべてcにする
+  def assign(self, l: int, r: int, c: str):
+    # assert 0 <= l <= r <= self.n
+    if l < r:
+      self._replace(l, r, ((self.DIC[c], r-l),))
+
+  # 区間[l, r)をソートする
+  def sort_range(self, l: int, r: int, reverse: bool=False):
+    # assert 0 <= l <= r <= self.n
+    if l >= r: return
+    runs = list(enumerate(self.get_all_count(l, r)))
+    if reverse:
+      runs.reverse()
+    self._replace(l, r, runs)
 
   # 区間[l, r)の全ての文字の個数を返す
-  # 返り値は要素数26のList[int]
+  # 返り値は要素数σのList[int]
   def get_all_count(self, l: int, r: int):
-    return [self.data[i].sum(l, r) for i in range(26)]
+    res = [self._pref(i, r) - self._pref(i, l) for i in range(self.sigma)]
+    if r > 0:
+      _, _, e, d = self._run_at(r-1)
+      res[d] -= e - r
+    if l > 0:
+      _, _, e, d = self._run_at(l-1)
+      res[d] += e - l
+    return res
 
   # 区間[l, r)のcの個数を返す
   def get_count(self, l: int, r: int, c: str):
-    return self.data[StringCount.DIC[c]].sum(l, r)
+    c = self.DIC[c]
+    return self._count_pref(c, r) - self._count_pref(c, l)
 
   def __getitem__(self, item):
     if isinstance(item, int):
-      return self.s[item]
+      if item < 0:
+        item += self.n
+      return self.alp[self._run_at(item)[3]]
     elif isinstance(item, slice):
-      return ''.join(self.s[item])
+      l, r, step = item.indices(self.n)
+      if step > 0:
+        res = self._substr(l, r)
+      else:
+        res = self._substr(r+1, l+1)[::-1]
+        step = -step
+      return res if step == 1 else res[::step]
     raise TypeError
 
   def __str__(self):
-    return ''.join(self.s)
-
+    return self._substr(0, self.n)
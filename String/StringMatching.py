@@ -0,0 +1,172 @@
+from typing import List, Tuple, Union, Iterable
+from array import array
+from collections import deque
+
+def z_algorithm(s: Union[str, bytes, List[int]]) -> List[int]:
+  '''z[i] = LCP(s, s[i:]) を返す. / O(N)'''
+  n = len(s)
+  if n == 0: return []
+  z = [0] * n
+  z[0] = n
+  l = r = 0
+  for i in range(1, n):
+    k = min(r-i, z[i-l]) if i < r else 0
+    while i+k < n and s[k] == s[i+k]:
+      k += 1
+    z[i] = k
+    if i+k > r:
+      l, r = i, i+k
+  return z
+
+def prefix_function(s: Union[str, bytes, List[int]]) -> List[int]:
+  '''pi[i] = s[:i+1]の真の接頭辞かつ接尾辞である最長の長さ を返す(KMP). / O(N)'''
+  n = len(s)
+  pi = [0] * n
+  for i in range(1, n):
+    k = pi[i-1]
+    while k and s[i] != s[k]:
+      k = pi[k-1]
+    if s[i] == s[k]:
+      k += 1
+    pi[i] = k
+  return pi
+
+def kmp_find_all(s: Union[str, bytes, List[int]], t: Union[str, bytes, List[int]]) -> List[int]:
+  '''sにおけるtの出現位置を昇順に返す. / O(|s|+|t|)'''
+  m = len(t)
+  if m == 0: return list(range(len(s)+1))
+  pi = prefix_function(t)
+  res = []
+  k = 0
+  for i, c in enumerate(s):
+    while k and c != t[k]:
+      k = pi[k-1]
+    if c == t[k]:
+      k += 1
+    if k == m:
+      res.append(i-m+1)
+      k = pi[k-1]
+  return res
+
+
+class AhoCorasick():
+  # 複数パターンのマッチング
+  # バイト列として扱う(strはutf-8でエンコードする). 位置はバイト単位
+  # 遷移はパターンに現れる文字だけに座標圧縮し、array('i')の表で持つ
+
+  def __init__(self, patterns: Iterable[Union[str, bytes]]):
+    patterns = [p.encode() if isinstance(p, str) else bytes(p) for p in patterns]
+    assert all(patterns), 'AhoCorasick: empty pattern'
+    # 0: パターンに現れない文字
+    cmap = array('i', bytes(4*256))
+    sigma = 1
+    for p in patterns:
+      for c in p:
+        if cmap[c] == 0:
+          cmap[c] = sigma
+          sigma += 1
+    goto = array('i', [-1]) * sigma
+    out = [[]]
+    for i, p in enumerate(patterns):
+      v = 0
+      for c in p:
+        j = v * sigma + cmap[c]
+        if goto[j] == -1:
+          goto[j] = len(out)
+          goto.extend(array('i', [-1]) * sigma)
+          out.append([])
+        v = goto[j]
+      out[v].append(i)
+    size = len(out)
+    fail = array('i', bytes(4*size))
+    # link[v]: failを辿って最初に出現するパターンを持つ状態 (なければ-1)
+    link = array('i', [-1]) * size
+    order = array('i')
+    dq = deque()
+    for c in range(sigma):
+      u = goto[c]
+      if u == -1:
+        goto[c] = 0
+      else:
+        dq.append(u)
+    while dq:
+      v = dq.popleft()
+      order.append(v)
+      f = fail[v]
+      link[v] = f if out[f] else link[f]
+      vs, fs = v * sigma, f * sigma
+      for c in range(sigma):
+        u = goto[vs+c]
+        if u == -1:
+          goto[vs+c] = goto[fs+c]
+        else:
+          fail[u] = goto[fs+c]
+          dq.append(u)
+    self._patterns = patterns
+    self._lens = [len(p) for p in patterns]
+    self._cmap = cmap
+    self._sigma = sigma
+    self._goto = goto
+    self._fail = fail
+    self._out = out
+    self._link = link
+    self._order = order
+    self._state = 0
+    self._pos = 0
+
+  def _to_bytes(self, text: Union[str, bytes]) -> bytes:
+    return text.encode() if isinstance(text, str) else text
+
+  def match(self, text: Union[str, bytes]) -> List[Tuple[int, int]]:
+    '''(出現位置の先頭, パターン番号)のリストを返す. / O(|text| + 出現数)'''
+    state, pos = self._state, self._pos
+    self._state, self._pos = 0, 0
+    res = self.feed(text)
+    self._state, self._pos = state, pos
+    return res
+
+  def feed(self, chunk: Union[str, bytes]) -> List[Tuple[int, int]]:
+    '''
+    ストリーミング用. 前回までのfeedの続きとしてchunkを読み、
+    新たに見つかった(出現位置の先頭, パターン番号)を返す. 位置は最初のfeedからの通算
+    '''
+    chunk = self._to_bytes(chunk)
+    goto, cmap, sigma, out, link, lens = self._goto, self._cmap, self._sigma, self._out, self._link, self._lens
+    v = self._state
+    pos = self._pos
+    res = []
+    for i, c in enumerate(chunk, pos+1):
+      v = goto[v*sigma+cmap[c]]
+      u = v if out[v] else link[v]
+      while u > 0:
+        for k in out[u]:
+          res.append((i-lens[k], k))
+        u = link[u]
+    self._state = v
+    self._pos = pos + len(chunk)
+    return res
+
+  def reset(self) -> None:
+    '''feedの状態を初期化する'''
+    self._state = 0
+    self._pos = 0
+
+  def count(self, text: Union[str, bytes]) -> List[int]:
+    '''各パターンの出現回数を返す. / O(|text| + 状態数)'''
+    text = self._to_bytes(text)
+    goto, cmap, sigma, fail = self._goto, self._cmap, self._sigma, self._fail
+    cnt = [0] * len(self._out)
+    v = 0
+    for c in text:
+      v = goto[v*sigma+cmap[c]]
+      cnt[v] += 1
+    order = self._order
+    for i in range(len(order)-1, -1, -1):
+      v = order[i]
+      cnt[fail[v]] += cnt[v]
+    res = [0] * len(self._patterns)
+    for v, ks in enumerate(self._out):
+      for k in ks:
+        res[k] = cnt[v]
+    return res
+
@@ -0,0 +1,197 @@
+from typing import List, Union, Tuple, Optional
+
+class SuffixArray():
+  # SA-IS法で接尾辞配列をO(N)で、Kasai法でLCP配列をO(N)で求める
+  # 任意の2つの接尾辞のLCPはStaticRmQでO(1)
+  # StaticRmQ(DataStructures/StaticArrayQuery/StaticRmQ.py)が必要
+
+  @staticmethod
+  def _sa_is(s: List[int], upper: int) -> List[int]:
+    n = len(s)
+    if n == 0: return []
+    if n == 1: return [0]
+    if n == 2: return [0, 1] if s[0] < s[1] else [1, 0]
+    sa = [0] * n
+    ls = [False] * n
+    for i in range(n-2, -1, -1):
+      ls[i] = ls[i+1] if s[i] == s[i+1] else (s[i] < s[i+1])
+    sum_l = [0] * (upper+1)
+    sum_s = [0] * (upper+1)
+    for i in range(n):
+      if not ls[i]:
+        sum_s[s[i]] += 1
+      else:
+        sum_l[s[i]+1] += 1
+    for i in range(upper+1):
+      sum_s[i] += sum_l[i]
+      if i < upper:
+        sum_l[i+1] += sum_s[i]
+
+    def induce(lms: List[int]) -> None:
+      for i in range(n):
+        sa[i] = -1
+      buf = sum_s[:]
+      for d in lms:
+        if d == n: continue
+        sa[buf[s[d]]] = d
+        buf[s[d]] += 1
+      buf = sum_l[:]
+      sa[buf[s[n-1]]] = n - 1
+      buf[s[n-1]] += 1
+      for i in range(n):
+        v = sa[i]
+        if v >= 1 and not ls[v-1]:
+          sa[buf[s[v-1]]] = v - 1
+          buf[s[v-1]] += 1
+      buf = sum_l[:]
+      for i in range(n-1, -1, -1):
+        v = sa[i]
+        if v >= 1 and ls[v-1]:
+          buf[s[v-1]+1] -= 1
+          sa[buf[s[v-1]+1]] = v - 1
+
+    lms_map = [-1] * (n+1)
+    m = 0
+    for i in range(1, n):
+      if not ls[i-1] and ls[i]:
+        lms_map[i] = m
+        m += 1
+    lms = [i for i in range(1, n) if not ls[i-1] and ls[i]]
+    induce(lms)
+
+    if m:
+      sorted_lms = [v for v in sa if lms_map[v] != -1]
+      rec_s = [0] * m
+      rec_upper = 0
+      rec_s[lms_map[sorted_lms[0]]] = 0
+      for i in range(1, m):
+        l, r = sorted_lms[i-1], sorted_lms[i]
+        end_l = lms[lms_map[l]+1] if lms_map[l]+1 < m else n
+        end_r = lms[lms_map[r]+1] if lms_map[r]+1 < m else n
+        same = True
+        if end_l - l != end_r - r:
+          same = False
+        else:
+          while l < end_l:
+            if s[l] != s[r]: break
+            l += 1
+            r += 1
+          if l == n or s[l] != s[r]:
+            same = False
+        if not same:
+          rec_upper += 1
+        rec_s[lms_map[sorted_lms[i]]] = rec_upper
+      rec_sa = SuffixArray._sa_is(rec_s, rec_upper)
+      for i in range(m):
+        sorted_lms[i] = lms[rec_sa[i]]
+      induce(sorted_lms)
+    return sa
+
+  def __init__(self, s: Union[str, bytes, List[int]]):
+    if isinstance(s, str):
+      s = [ord(c) for c in s]
+    else:
+      s = list(s)
+    n = len(s)
+    comp = None
+    if s:
+      # 座標圧縮して upper を小さくする
+      vals = sorted(set(s))
+      if vals[0] < 0 or vals[-1] >= 2*n + 256:
+        comp = {v: i for i, v in enumerate(vals)}
+        s = [comp[c] for c in s]
+      upper = max(s)
+    else:
+      upper = 0
+    sa = SuffixArray._sa_is(s, upper)
+    rank = [0] * n
+    for i, v in enumerate(sa):
+      rank[v] = i
+    # lcp[i]: sa[i]とsa[i+1]のLCP (長さn-1)
+    lcp = [0] * max(n-1, 0)
+    h = 0
+    for i in range(n):
+      if h: h -= 1
+      if rank[i] == 0: continue
+      j = sa[rank[i]-1]
+      while j+h < n and i+h < n and s[j+h] == s[i+h]:
+        h += 1
+      lcp[rank[i]-1] = h
+    self.n = n
+    self.s = s
+    self.sa = sa
+    self.rank = rank
+    self.lcp = lcp
+    self._comp = comp
+    self._rmq = None
+
+  def get_lcp(self, i: int, j: int) -> int:
+    '''接尾辞s[i:]とs[j:]の最長共通接頭辞の長さを返す. O(1)'''
+    if i == j: return self.n - i
+    if self._rmq is None:
+      self._rmq = StaticRmQ(self.lcp, INF=self.n)
+    ri, rj = self.rank[i], self.rank[j]
+    if ri > rj: ri, rj = rj, ri
+    return self._rmq.prod(ri, rj)
+
+  def compare(self, l1: int, r1: int, l2: int, r2: int) -> int:
+    '''s[l1:r1]とs[l2:r2]を辞書順比較し, -1/0/1を返す. O(1)'''
+    n1, n2 = r1 - l1, r2 - l2
+    k = min(self.get_lcp(l1, l2) if l1 < self.n and l2 < self.n else 0, n1, n2)
+    if k == n1 or k == n2:
+      return (n1 > n2) - (n1 < n2)
+    return -1 if self.s[l1+k] < self.s[l2+k] else 1
+
+  def _to_list(self, t: Union[str, bytes, List[int]]) -> Optional[List[int]]:
+    # sと同じ座標圧縮をする. sに現れない文字を含むならNone
+    t = [ord(c) for c in t] if isinstance(t, str) else list(t)
+    comp = self._comp
+    if comp is None: return t
+    res = []
+    for c in t:
+      c = comp.get(c)
+      if c is None: return None
+      res.append(c)
+    return res
+
+  def find(self, t: Union[str, bytes, List[int]]) -> Tuple[int, int]:
+    '''
+    tを接頭辞にもつ接尾辞がsa[lo:hi]であるような(lo, hi)を返す. O(|t|logN)
+    tが空なら(0, N). 空の接尾辞(位置N)はsaに含まれないので、count / find_allで別に数える
+    '''
+    t = self._to_list(t)
+    if t is None: return 0, 0
+    s, sa, n, m = self.s, self.sa, self.n, len(t)
+    lo, hi = 0, n
+    while lo < hi:
+      mid = (lo + hi) // 2
+      if s[sa[mid]:sa[mid]+m] < t:
+        lo = mid + 1
+      else:
+        hi = mid
+    left = lo
+    hi = n
+    while lo < hi:
+      mid = (lo + hi) // 2
+      if s[sa[mid]:sa[mid]+m] <= t:
+        lo = mid + 1
+      else:
+        hi = mid
+    return left, lo
+
+  def count(self, t: Union[str, bytes, List[int]]) -> int:
+    '''tの出現回数を返す. tが空ならN+1 (SuffixAutomaton.countと同じ)'''
+    if len(t) == 0: return self.n + 1
+    lo, hi = self.find(t)
+    return hi - lo
+
+  def find_all(self, t: Union[str, bytes, List[int]]) -> List[int]:
+    '''tの出現位置を昇順に返す. tが空なら[0, 1, ..., N]'''
+    if len(t) == 0: return list(range(self.n + 1))
+    lo, hi = self.find(t)
+    return sorted(self.sa[lo:hi])
+
+  def count_distinct_substrings(self) -> int:
+    '''相異なる部分文字列(空文字列を除く)の個数を返す'''
+    return self.n * (self.n + 1) // 2 - sum(self.lcp)
+
@@ -0,0 +1,189 @@
+from typing import List, Union, Tuple
+from array import array
+
+class SuffixAutomaton():
+  # 接尾辞オートマトン
+  # 文字はsに現れるものだけに座標圧縮する(辞書順は保つ)
+  # 文字の種類数がFLAT_LIMIT以下なら遷移を1本のarray('i')で、そうでなければ状態ごとのdictで持つ
+
+  FLAT_LIMIT = 64
+
+  def __init__(self, s: Union[str, List[int]]):
+    self._is_str = isinstance(s, str)
+    chars = sorted(set(s))
+    comp = {c: i for i, c in enumerate(chars)}
+    sigma = len(chars)
+    n = len(s)
+    m = 2 * n + 1
+    length = array('i', bytes(4*m))
+    link = array('i', [-1]) * m
+    cnt = array('i', bytes(4*m))
+    flat = sigma <= SuffixAutomaton.FLAT_LIMIT
+    if flat:
+      nxt = array('i', [-1]) * (m * max(sigma, 1))
+    else:
+      nxt = [{} for _ in range(m)]
+    size = 1
+    last = 0
+    for ch in s:
+      c = comp[ch]
+      cur = size
+      size += 1
+      length[cur] = length[last] + 1
+      cnt[cur] = 1
+      p = last
+      if flat:
+        while p != -1 and nxt[p*sigma+c] == -1:
+          nxt[p*sigma+c] = cur
+          p = link[p]
+        if p == -1:
+          link[cur] = 0
+        else:
+          q = nxt[p*sigma+c]
+          if length[p] + 1 == length[q]:
+            link[cur] = q
+          else:
+            clone = size
+            size += 1
+            length[clone] = length[p] + 1
+            nxt[clone*sigma:clone*sigma+sigma] = nxt[q*sigma:q*sigma+sigma]
+            link[clone] = link[q]
+            while p != -1 and nxt[p*sigma+c] == q:
+              nxt[p*sigma+c] = clone
+              p = link[p]
+            link[q] = link[cur] = clone
+      else:
+        while p != -1 and c not in nxt[p]:
+          nxt[p][c] = cur
+          p = link[p]
+        if p == -1:
+          link[cur] = 0
+        else:
+          q = nxt[p][c]
+          if length[p] + 1 == length[q]:
+            link[cur] = q
+          else:
+            clone = size
+            size += 1
+            length[clone] = length[p] + 1
+            nxt[clone] = nxt[q].copy()
+            link[clone] = link[q]
+            while p != -1 and nxt[p].get(c) == q:
+              nxt[p][c] = clone
+              p = link[p]
+            link[q] = link[cur] = clone
+      last = cur
+
+    # 長さの昇順に並べる(計数ソート)
+    bucket = [0] * (n+2)
+    for v in range(size):
+      bucket[length[v]+1] += 1
+    for i in range(n+1):
+      bucket[i+1] += bucket[i]
+    order = array('i', bytes(4*size))
+    for v in range(size):
+      order[bucket[length[v]]] = v
+      bucket[length[v]] += 1
+    # cnt[v]: vに対応する部分文字列の出現回数(endposの大きさ)
+    for i in range(size-1, 0, -1):
+      v = order[i]
+      cnt[link[v]] += cnt[v]
+
+    self.n = n
+    self.size = size
+    self._chars = chars
+    self._comp = comp
+    self._sigma = sigma
+    self._flat = flat
+    self._nxt = nxt
+    self._len = length
+    self._link = link
+    self._cnt = cnt
+    self._order = order
+    self._dp = None
+
+  def _next(self, v: int, c: int) -> int:
+    if self._flat:
+      return self._nxt[v*self._sigma+c]
+    return self._nxt[v].get(c, -1)
+
+  def _children(self, v: int) -> List[Tuple[int, int]]:
+    # (文字, 遷移先)を文字の昇順に
+    if self._flat:
+      nxt, sigma = self._nxt, self._sigma
+      return [(c, nxt[v*sigma+c]) for c in range(sigma) if nxt[v*sigma+c] != -1]
+    return sorted(self._nxt[v].items())
+
+  def _walk(self, t: Union[str, List[int]]) -> int:
+    v = 0
+    comp = self._comp
+    for ch in t:
+      c = comp.get(ch, -1)
+      if c == -1: return -1
+      v = self._next(v, c)
+      if v == -1: return -1
+    return v
+
+  def count_distinct_substrings(self) -> int:
+    '''相異なる部分文字列(空文字列を除く)の個数を返す. / O(N)'''
+    length, link = self._len, self._link
+    return sum(length[v] - length[link[v]] for v in range(1, self.size))
+
+  def count(self, t: Union[str, List[int]]) -> int:
+    '''tの出現回数を返す. / O(|t|)'''
+    if len(t) == 0: return self.n + 1
+    v = self._walk(t)
+    return 0 if v == -1 else self._cnt[v]
+
+  def contains(self, t: Union[str, List[int]]) -> bool:
+    return self._walk(t) != -1
+
+  def kth_substring(self, k: int) -> Union[str, List[int], None]:
+    '''相異なる部分文字列のうち辞書順でk番目(1-indexed)のものを返す. なければNone'''
+    if self._dp is None:
+      # dp[v]: vから出るパス(空を含む)の個数
+      dp = [1] * self.size
+      order = self._order
+      for i in range(self.size-1, -1, -1):
+        v = order[i]
+        for _, u in self._children(v):
+          dp[v] += dp[u]
+      self._dp = dp
+    dp = self._dp
+    if k <= 0 or k >= dp[0]: return None
+    res = []
+    v = 0
+    while k:
+      for c, u in self._children(v):
+        if k <= dp[u]:
+          res.append(self._chars[c])
+          k -= 1
+          v = u
+          break
+        k -= dp[u]
+    return ''.join(res) if self._is_str else res
+
+  def lcs(self, t: Union[str, List[int]]) -> Union[str, List[int]]:
+    '''sとtの最長共通部分文字列を返す. / O(|t|)'''
+    comp, length, link = self._comp, self._len, self._link
+    v = l = 0
+    best = best_end = 0
+    for i, ch in enumerate(t):
+      c = comp.get(ch, -1)
+      if c == -1:
+        v = l = 0
+        continue
+      while v and self._next(v, c) == -1:
+        v = link[v]
+        l = length[v]
+      u = self._next(v, c)
+      if u == -1:
+        v = l = 0
+        continue
+      v = u
+      l += 1
+      if l > best:
+        best = l
+        best_end = i + 1
+    return t[best_end-best:best_end]
+
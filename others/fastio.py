@@ -1,4 +1,6 @@
-import io, os
+import io, os, mmap, re
+from array import array
+from typing import List
 
 class FastIO():
 
@@ -8,6 +10,8 @@ class FastIO():
   output_buf = io.BytesIO()
   num_line = 0
   BUFSIZE = (1<<18)-1
+  # 出力がこの大きさ(バイト)を超えたらflushする
+  FLUSH_THRESHOLD = 1<<20
 
   @classmethod
   def input(cls):
@@ -33,6 +37,65 @@ class FastIO():
     cls.num_line -= 1
     return cls.input_buf.readline()
 
+  # read_int/read_ints/read_tokensは行の途中まで読んだトークンを覚えている
+  # (input/buf_inputと混ぜるときは、行末まで読み切ってから使うこと)
+  _tokens = []
+  _tokens_ptr = 0
+
+  @classmethod
+  def _fill_tokens(cls) -> None:
+    while cls._tokens_ptr == len(cls._tokens):
+      line = cls.buf_input()
+      if not line:
+        raise EOFError
+      cls._tokens = line.split()
+      cls._tokens_ptr = 0
+
+  @classmethod
+  def read_tokens(cls) -> List[bytes]:
+    '''
+    行の残りのトークンをbytesのまま返す(デコードしない)
+    行の残りが空白だけなら、次の空でない行を返す. 入力の終わりなら[]
+    '''
+    if cls._tokens_ptr < len(cls._tokens):
+      res = cls._tokens[cls._tokens_ptr:]
+    else:
+      while True:
+        line = cls.buf_input()
+        res = line.split()
+        if res or not line:
+          break
+    cls._tokens = []
+    cls._tokens_ptr = 0
+    return res
+
+  @classmethod
+  def read_int(cls) -> int:
+    '''次の整数を1つ返す(改行をまたぐ)'''
+    if cls._tokens_ptr == len(cls._tokens):
+      cls._fill_tokens()
+    cls._tokens_ptr += 1
+    return int(cls._tokens[cls._tokens_ptr-1])
+
+  @classmethod
+  def read_ints(cls, n: int) -> array:
+    '''次のn個の整数をarray('q')で返す(改行をまたぐ)'''
+    res = array('q')
+    while n > 0:
+      if cls._tokens_ptr == len(cls._tokens):
+        cls._fill_tokens()
+      ptr = cls._tokens_ptr
+      k = min(n, len(cls._tokens)-ptr)
+      res.extend(map(int, cls._tokens[ptr:ptr+k]))
+      cls._tokens_ptr = ptr + k
+      n -= k
+    return res
+
+  @classmethod
+  def read_matrix(cls, h: int, w: int) -> List[array]:
+    '''h行w列の整数をarray('q')のリストで返す'''
+    return [cls.read_ints(w) for _ in range(h)]
+
   @classmethod
   def write(cls, *args, sep=' ', end='\n', flush=False):
     for i in range(len(args)-1):
@@ -41,7 +104,14 @@ class FastIO():
     if args:
       cls.output_buf.write(str(args[-1]).encode())
     cls.output_buf.write(end.encode())
-    if flush:
+    if flush or cls.output_buf.tell() >= cls.FLUSH_THRESHOLD:
+      cls.flush()
+
+  @classmethod
+  def write_ints(cls, a, sep: str=' ', end: str='\n', flush: bool=False):
+    '''整数の列aをsep区切りで1回のjoinで書き込む'''
+    cls.output_buf.write((sep.join(map(str, a)) + end).encode())
+    if flush or cls.output_buf.tell() >= cls.FLUSH_THRESHOLD:
       cls.flush()
 
   @classmethod
@@ -50,7 +120,79 @@ class FastIO():
     cls.output_buf.truncate(0)
     cls.output_buf.seek(0)
 
+
+class MmapInput():
+
+  # 入力が通常のファイルのとき、mmapしてその場でトークンを切り出す
+  # ファイル全体をメモリに読み込まないので、巨大な入力でもメモリはほぼ一定
+  # if MmapInput.open(): read_int = MmapInput.read_int のように使う
+
+  mm = None
+  pos = 0
+  _token = re.compile(rb'\S+')
+
+  @classmethod
+  def open(cls, fd: int=0) -> bool:
+    '''fdをmmapする. 通常のファイルでない(パイプなど)・空ならFalseを返す'''
+    try:
+      cls.mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+    except (ValueError, OSError):
+      cls.mm = None
+      return False
+    cls.pos = 0
+    return True
+
+  @classmethod
+  def read_int(cls) -> int:
+    m = cls._token.search(cls.mm, cls.pos)
+    if m is None:
+      raise EOFError
+    cls.pos = m.end()
+    return int(m.group())
+
+  @classmethod
+  def read_ints(cls, n: int) -> array:
+    '''次のn個の整数をarray('q')で返す(改行をまたぐ)'''
+    res = array('q')
+    if n <= 0:
+      return res
+    end = cls.pos
+    for m in cls._token.finditer(cls.mm, cls.pos):
+      res.append(int(m.group()))
+      if len(res) == n:
+        end = m.end()
+        break
+    else:
+      raise EOFError
+    cls.pos = end
+    return res
+
+  @classmethod
+  def read_matrix(cls, h: int, w: int) -> List[array]:
+    return [cls.read_ints(w) for _ in range(h)]
+
+  @classmethod
+  def read_tokens(cls) -> List[bytes]:
+    '''
+    行の残りのトークンをbytesで返す
+    行の残りが空白だけなら、次の空でない行を返す. 入力の終わりなら[] (FastIO.read_tokensと同じ)
+    '''
+    mm = cls.mm
+    n = len(mm)
+    while cls.pos < n:
+      end = mm.find(b'\n', cls.pos)
+      if end == -1:
+        end = n
+      res = mm[cls.pos:end].split()
+      cls.pos = end + 1
+      if res:
+        return res
+    return []
+
 buf_input = FastIO.buf_input
 input = FastIO.input
+read_int = FastIO.read_int
+read_ints = FastIO.read_ints
 write = FastIO.write
+write_ints = FastIO.write_ints
 flush = FastIO.flush